@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Generic, Optional, Tuple, TypeVar
+
+logger = logging.getLogger("red.owo.redditinfo")
+
+T = TypeVar("T")
+
+DEFAULT_ICON = "https://i.imgur.com/DSBOK0P.png"
+
+# only keep what embeds and commands actually read, `about.json` is mostly html blobs
+ABOUT_FIELDS = (
+    "url",
+    "title",
+    "display_name",
+    "display_name_prefixed",
+    "public_description",
+    "icon_img",
+    "community_icon",
+    "banner_img",
+    "created_utc",
+    "subscribers",
+    "active_user_count",
+    "over18",
+    "dist",
+    "wiki_enabled",
+    "can_assign_user_flair",
+    "allow_galleries",
+    "public_traffic",
+    "hide_ads",
+    "emojis_enabled",
+    "community_reviewed",
+    "spoilers_enabled",
+    "allow_discovery",
+    "allow_videos",
+    "allow_images",
+    "submission_type",
+    "advertiser_category",
+    "whitelist_status",
+)
+
+
+class TTLCache(Generic[T]):
+    """Small in-memory mapping where every entry expires ``ttl`` seconds after insertion."""
+
+    def __init__(self, ttl: float, *, maxsize: int = 1024) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[str, Tuple[float, T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str, *, max_age: Optional[float] = None) -> Optional[T]:
+        entry = self._data.get(key.lower())
+        if entry is None:
+            return None
+        stored_at, value = entry
+        age = time.time() - stored_at
+        if age > self.ttl:
+            del self._data[key.lower()]
+            return None
+        if max_age is not None and age > max_age:
+            return None
+        return value
+
+    def put(self, key: str, value: T, *, stored_at: Optional[float] = None) -> None:
+        if len(self._data) >= self.maxsize and key.lower() not in self._data:
+            self.evict_expired()
+            if len(self._data) >= self.maxsize:
+                oldest = min(self._data, key=lambda k: self._data[k][0])
+                del self._data[oldest]
+        self._data[key.lower()] = (stored_at or time.time(), value)
+
+    def evict_expired(self) -> int:
+        cutoff = time.time() - self.ttl
+        expired = [k for k, (stored_at, _) in self._data.items() if stored_at < cutoff]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+
+class SubredditCache(TTLCache[Dict[str, Any]]):
+    """Subreddit ``about.json`` metadata, snapshotted to disk so it survives reloads."""
+
+    def __init__(self, path: Path, ttl: float = 86400.0, *, maxsize: int = 5000) -> None:
+        super().__init__(ttl, maxsize=maxsize)
+        self.path = path
+        self.dirty = False
+
+    def put(self, key: str, value: Dict[str, Any], *, stored_at: Optional[float] = None) -> None:
+        slim = {k: value[k] for k in ABOUT_FIELDS if k in value}
+        super().put(key, slim, stored_at=stored_at)
+        self.dirty = True
+
+    @staticmethod
+    def icon(data: Dict[str, Any]) -> str:
+        if data.get("icon_img"):
+            return data["icon_img"]
+        if data.get("community_icon"):
+            return data["community_icon"].split("?")[0]
+        return DEFAULT_ICON
+
+    def load(self) -> None:
+        try:
+            with self.path.open(encoding="utf-8") as fp:
+                snapshot: Dict[str, Any] = json.load(fp)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logger.warning("Could not read subreddit metadata snapshot, starting fresh.")
+            return
+
+        for key, (stored_at, value) in snapshot.items():
+            super().put(key, value, stored_at=stored_at)
+        self.evict_expired()
+        self.dirty = False
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.evict_expired()
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            with tmp.open("w", encoding="utf-8") as fp:
+                json.dump(self._data, fp, separators=(",", ":"))
+            tmp.replace(self.path)
+        except OSError:
+            logger.exception("Failed to write subreddit metadata snapshot!")
+            return
+        self.dirty = False
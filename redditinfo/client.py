@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+
+import aiohttp
+
+from .stats import LatencyHistogram
+
+logger = logging.getLogger("red.owo.redditinfo")
+
+USER_AGENT = {"User-Agent": "Red-DiscordBot:owo-cogs.redditinfo (by /u/ow0x)"}
+# returned by RedditClient.get in place of a status code when the request failed or timed out
+TIMEOUT = 408
+
+
+@dataclass
+class RateLimitStats:
+    remaining: Optional[float] = None
+    used: Optional[int] = None
+    reset_at: float = 0.0
+    total_requests: int = 0
+    throttled: int = 0
+    retries: int = 0
+    waiting: int = 0
+    waited_seconds: float = 0.0
+
+    @property
+    def resets_in(self) -> float:
+        return max(self.reset_at - time.monotonic(), 0.0)
+
+    def __str__(self) -> str:
+        remaining = "unknown" if self.remaining is None else f"{self.remaining:.0f}"
+        return (
+            f"Remaining budget:  {remaining} (used {self.used or 0})\n"
+            f"Budget resets in:  {self.resets_in:.0f} seconds\n"
+            f"Requests made:  {self.total_requests:,}\n"
+            f"429 responses:  {self.throttled:,} ({self.retries:,} retries)\n"
+            f"Requests waiting:  {self.waiting}\n"
+            f"Total time spent waiting:  {self.waited_seconds:.1f} seconds"
+        )
+
+
+class RedditClient:
+    """Reddit API client aware of ``X-Ratelimit-*`` headers.
+
+    Requests wait in line when the remaining budget drops to ``reserve``
+    until the window resets, and 429 responses are retried with
+    exponential backoff plus full jitter.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        *,
+        reserve: int = 5,
+        max_retries: int = 3,
+        base_delay: float = 2.0,
+        max_delay: float = 60.0,
+    ) -> None:
+        self.session = session
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats = RateLimitStats()
+        self.latency = LatencyHistogram()
+        self._lock = asyncio.Lock()
+
+    async def _acquire(self) -> None:
+        # the lock makes callers queue up behind whoever is waiting for the reset
+        self.stats.waiting += 1
+        try:
+            async with self._lock:
+                remaining = self.stats.remaining
+                if remaining is not None and remaining <= self.reserve:
+                    delay = self.stats.resets_in
+                    if delay > 0:
+                        logger.debug(f"Reddit ratelimit budget low, waiting {delay:.1f}s")
+                        self.stats.waited_seconds += delay
+                        await asyncio.sleep(delay)
+                    # assume a fresh window until the next response says otherwise
+                    self.stats.remaining = None
+                elif remaining is not None:
+                    self.stats.remaining = remaining - 1
+        finally:
+            self.stats.waiting -= 1
+
+    def _update(self, headers: Any) -> None:
+        try:
+            if (remaining := headers.get("X-Ratelimit-Remaining")) is not None:
+                self.stats.remaining = float(remaining)
+            if (used := headers.get("X-Ratelimit-Used")) is not None:
+                self.stats.used = int(float(used))
+            if (reset := headers.get("X-Ratelimit-Reset")) is not None:
+                self.stats.reset_at = time.monotonic() + float(reset)
+        except ValueError:
+            pass
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return max(delay, self.stats.resets_in if self.stats.remaining == 0 else 0.0)
+
+    async def get(
+        self, url: str, *, params: Optional[Dict[str, Any]] = None
+    ) -> Union[int, Any]:
+        """Returns decoded JSON on success, otherwise the HTTP status code or TIMEOUT."""
+        for attempt in range(self.max_retries + 1):
+            await self._acquire()
+            self.stats.total_requests += 1
+            started = time.perf_counter()
+            try:
+                async with self.session.get(url, headers=USER_AGENT, params=params) as resp:
+                    self.latency.observe(time.perf_counter() - started)
+                    self._update(resp.headers)
+                    if resp.status == 429:
+                        self.stats.throttled += 1
+                        if attempt == self.max_retries:
+                            logger.info(f"Reddit ratelimited {url} after {attempt} retries")
+                            return 429
+                        delay = self._backoff(attempt, resp.headers.get("Retry-After"))
+                    elif resp.status != 200:
+                        logger.info(f"Reddit sent non 2xx response code: {resp.status}")
+                        return resp.status
+                    else:
+                        return await resp.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.latency.observe(time.perf_counter() - started)
+                logger.exception(f"Error while fetching {url} from Reddit!", exc_info=True)
+                return TIMEOUT
+
+            self.stats.retries += 1
+            self.stats.waited_seconds += delay
+            await asyncio.sleep(delay)
+        return 429
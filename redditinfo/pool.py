@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Sequence
+
+import discord
+
+
+@dataclass
+class PooledPost:
+    post_id: str
+    embed: discord.Embed
+    expires_at: float
+
+
+class PostPool:
+    """Queue of ready-to-send SFW post embeds for a group of subreddits."""
+
+    def __init__(self, subreddits: Sequence[str], *, size: int = 5, ttl: float = 900.0) -> None:
+        self.subreddits = subreddits
+        self.size = size
+        self.ttl = ttl
+        self._queue: Deque[PooledPost] = deque()
+        # remember recently served posts so a refill doesn't queue them right back up
+        self._recent: Deque[str] = deque(maxlen=100)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def missing(self) -> int:
+        self.evict_expired()
+        return max(self.size - len(self._queue), 0)
+
+    def evict_expired(self) -> None:
+        now = time.monotonic()
+        self._queue = deque(post for post in self._queue if post.expires_at > now)
+
+    def wants(self, post_id: str) -> bool:
+        return post_id not in self._recent and all(p.post_id != post_id for p in self._queue)
+
+    def push(self, post_id: str, embed: discord.Embed) -> None:
+        self._queue.append(PooledPost(post_id, embed, time.monotonic() + self.ttl))
+
+    def pop(self) -> Optional[discord.Embed]:
+        self.evict_expired()
+        if not self._queue:
+            return None
+        post = self._queue.popleft()
+        self._recent.append(post.post_id)
+        return post.embed
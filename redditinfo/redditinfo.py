@@ -2,7 +2,7 @@ import asyncio
 import logging
 import random
 from datetime import datetime
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Set, Union
 
 import aiohttp
 import discord
@@ -10,8 +10,15 @@ from discord.ext import tasks
 from redbot.core import Config, commands
 from redbot.core.commands.context import Context
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
+from redbot.core.utils.chat_formatting import box
+from redbot.core.utils.menus import DEFAULT_CONTROLS, menu
 
+from .cache import DEFAULT_ICON, SubredditCache, TTLCache
+from .client import TIMEOUT, RedditClient
 from .handles import INTERESTING_SUBS, MEME_REDDITS
+from .pool import PostPool
+from .stats import TickStats, error_category
 
 logger = logging.getLogger("red.owo.redditinfo")
 
@@ -33,6 +40,20 @@ class RedditInfo(commands.Cog):
     def __init__(self, bot: Red) -> None:
         self.bot = bot
         self.session = aiohttp.ClientSession()
+        self.client = RedditClient(self.session)
+        self.subreddits = SubredditCache(cog_data_path(self) / "subreddits.json")
+        self.tick_stats = {
+            "automeme": TickStats("automeme"),
+            "randomfeed": TickStats("randomfeed"),
+        }
+        self.users: TTLCache[Union[int, Dict[str, Any]]] = TTLCache(600.0)
+        self.post_pools = {
+            "memes": PostPool(MEME_REDDITS),
+            "interesting": PostPool(INTERESTING_SUBS),
+        }
+        self._refilling: Set[str] = set()
+        # on demand refills, referenced here so they aren't garbage collected mid-run
+        self._refill_tasks: Set[asyncio.Task] = set()
         self.config = Config.get_conf(self, 357059159021060097, force_registration=True)
         default_guild = {"channel_id": None, "feed_channels": {}}
         self.config.register_channel(subreddit="")
@@ -40,57 +61,123 @@ class RedditInfo(commands.Cog):
         self.config.register_guild(**default_guild)
         self._autopost_meme.start()
         self._fetch_random_post_task.start()
+        self._save_subreddit_cache.start()
+        self._refill_post_pools.start()
 
     async def cog_load(self) -> None:
+        self.subreddits.load()
         delay: int = await self.config.interval()
         if delay != 5:
             self._autopost_meme.change_interval(minutes=delay)
             self._fetch_random_post_task.change_interval(minutes=delay)
 
     async def cog_unload(self) -> None:
+        for task in self._refill_tasks:
+            task.cancel()
         await self.session.close()
         self._autopost_meme.cancel()
         self._fetch_random_post_task.cancel()
+        self._save_subreddit_cache.cancel()
+        self._refill_post_pools.cancel()
+        self.subreddits.save()
 
     async def red_delete_data_for_user(self, **kwargs) -> None:
         """Nothing to delete"""
         pass
 
+    @tasks.loop(minutes=30)
+    async def _save_subreddit_cache(self) -> None:
+        self.subreddits.save()
+
+    @tasks.loop(minutes=2)
+    async def _refill_post_pools(self) -> None:
+        for name in self.post_pools:
+            await self._refill_pool(name)
+
+    @_refill_post_pools.before_loop
+    async def _before_refill_post_pools(self) -> None:
+        await self.bot.wait_until_ready()
+
+    async def _refill_pool(self, name: str) -> None:
+        if name in self._refilling:
+            return
+        pool = self.post_pools[name]
+        self._refilling.add(name)
+        try:
+            # at most one listing per missing slot, so a dry subreddit can't spin forever
+            for _ in range(pool.missing):
+                random_sub = random.choice(pool.subreddits)
+                data = await self.client.get(
+                    f"https://reddit.com/r/{random_sub}/hot.json?limit=25"
+                )
+                if isinstance(data, int):
+                    return
+                posts = [
+                    child["data"] for child in data.get("data", {}).get("children", [])
+                    if not child["data"].get("over_18")
+                    and not child["data"].get("stickied")
+                    and self._is_image_post(child["data"])
+                    and pool.wants(child["data"]["id"])
+                ]
+                random.shuffle(posts)
+                for post in posts[:pool.missing]:
+                    pool.push(post["id"], await self._build_post_embed(post))
+                if not pool.missing:
+                    return
+        except Exception:
+            logger.exception(f"Error while refilling {name} post pool!", exc_info=True)
+        finally:
+            self._refilling.discard(name)
+
+    async def _send_pooled_post(self, ctx: Context, name: str) -> bool:
+        embed = self.post_pools[name].pop()
+        if self.post_pools[name].missing:
+            task = asyncio.create_task(self._refill_pool(name))
+            self._refill_tasks.add(task)
+            task.add_done_callback(self._refill_tasks.discard)
+        if embed is None:
+            return False
+        await ctx.send(embed=embed)
+        return True
+
     @tasks.loop(minutes=5)
     async def _fetch_random_post_task(self) -> None:
-        all_data: dict = await self.config.all_channels()
-        for channel_id, data in all_data.items():
-            if not data["subreddit"]:
-                continue
-            channel = self.bot.get_channel(int(channel_id))
-            if not channel:
-                logger.info(f"Channel or thread by ID: {channel_id} could not be found!")
-                continue
-            bot_perms = channel.permissions_for(channel.guild.me)
-            if not bot_perms.send_messages:
-                logger.info(
-                    f"Missing send messages permission in {channel} (ID: {channel.id})"
-                )
-                continue
-            try:
-                async with self.session.get(
+        with self.tick_stats["randomfeed"].measure() as tick:
+            all_data: dict = await self.config.all_channels()
+            interval: int = await self.config.interval()
+            for channel_id, data in all_data.items():
+                if not data["subreddit"]:
+                    continue
+                channel = self.bot.get_channel(int(channel_id))
+                if not channel:
+                    logger.info(f"Channel or thread by ID: {channel_id} could not be found!")
+                    tick.skip(int(channel_id), "channel not found")
+                    continue
+                bot_perms = channel.permissions_for(channel.guild.me)
+                if not bot_perms.send_messages:
+                    logger.info(
+                        f"Missing send messages permission in {channel} (ID: {channel.id})"
+                    )
+                    tick.skip(channel.id, "missing send messages permission")
+                    continue
+                random_feeds = await self.client.get(
                     f"https://old.reddit.com/r/{data['subreddit']}/random.json"
-                ) as resp:
-                    if resp.status != 200:
-                        logger.info(f"Reddit sent non 2xx response code: {resp.status}")
-                        continue
-                    random_feeds = await resp.json()
-            except (aiohttp.ClientError, asyncio.TimeoutError):
-                logger.exception(f"Error while fetching hot meme from Reddit!", exc_info=True)
-                continue
-            try:
-                random_post: dict = random_feeds[0]["data"]["children"][0]["data"]
-                interval: int = await self.config.interval()
-                next_when = f"next post <t:{int(discord.utils.utcnow().timestamp()) + interval*60}:R>"
-                await channel.send(f"https://www.rxyddit.com{random_post['permalink']} | {next_when}")
-            except Exception as exc:
-                logger.exception("Error sending random auto post", exc_info=exc)
-                continue
+                )
+                if isinstance(random_feeds, int):
+                    tick.error(error_category(random_feeds))
+                    continue
+                try:
+                    random_post: dict = random_feeds[0]["data"]["children"][0]["data"]
+                    next_ts = int(discord.utils.utcnow().timestamp()) + interval * 60
+                    next_when = f"next post <t:{next_ts}:R>"
+                    await channel.send(
+                        f"https://www.rxyddit.com{random_post['permalink']} | {next_when}"
+                    )
+                except Exception as exc:
+                    logger.exception("Error sending random auto post", exc_info=exc)
+                    tick.error("send failed")
+                    continue
+                tick.sent += 1
 
     @_fetch_random_post_task.before_loop
     async def _before_fetch_random_post_task(self) -> None:
@@ -98,6 +185,10 @@ class RedditInfo(commands.Cog):
 
     @tasks.loop(minutes=5)
     async def _autopost_meme(self) -> None:
+        with self.tick_stats["automeme"].measure() as tick:
+            await self._autopost_meme_tick(tick)
+
+    async def _autopost_meme_tick(self, tick: TickStats) -> None:
         data = None
         all_config = await self.config.all_guilds()
         for guild_id, guild_data in all_config.items():
@@ -107,37 +198,40 @@ class RedditInfo(commands.Cog):
             guild = self.bot.get_guild(int(guild_id))
             if not guild:
                 logger.info(f"Guild by ID: {guild_id} could not be found!")
+                tick.skip(guild_data["channel_id"], "guild not found")
                 continue
             channel = guild.get_channel_or_thread(guild_data["channel_id"])
             if not channel:
                 logger.info(
                     f"Channel or thread by ID: {guild_data['channel_id']} could not be found!"
                 )
+                tick.skip(guild_data["channel_id"], "channel not found")
                 continue
             bot_perms = channel.permissions_for(guild.me)
             if not bot_perms.send_messages or not bot_perms.embed_links:
                 logger.info(
                     f"Missing send messages or embed links perms in {channel} (ID: {channel.id})"
                 )
+                tick.skip(channel.id, "missing send messages or embed links permission")
                 continue
             random_sub = random.choice(MEME_REDDITS)
-            try:
-                async with self.session.get(
-                    f"https://reddit.com/r/{random_sub}/hot.json?limit=10"
-                ) as resp:
-                    if resp.status != 200:
-                        logger.info(f"Reddit sent non 2xx response code: {resp.status}")
-                        continue
-                    data = await resp.json()
-            except (aiohttp.ClientError, asyncio.TimeoutError):
-                logger.exception(f"Error while fetching hot meme from Reddit!", exc_info=True)
+            data = await self.client.get(f"https://reddit.com/r/{random_sub}/hot.json?limit=10")
+            if isinstance(data, int):
+                tick.error(error_category(data))
                 continue
 
             embed = await self._fetch_random_post(data, channel)
             if not embed:
                 logger.info("Could not generate embed for autopost meme feed!")
+                tick.error("no postable meme")
+                continue
+            try:
+                await channel.send(embed=embed)
+            except discord.HTTPException as exc:
+                logger.exception("Error sending auto meme post", exc_info=exc)
+                tick.error("send failed")
                 continue
-            await channel.send(embed=embed)
+            tick.sent += 1
 
     @_autopost_meme.before_loop
     async def _before_autopost_meme(self) -> None:
@@ -149,17 +243,12 @@ class RedditInfo(commands.Cog):
     async def reddituser(self, ctx: Context, username: str):
         """Fetch basic info about a Reddit user account."""
         async with ctx.typing():
-            try:
-                async with self.session.get(
-                    f"https://reddit.com/user/{username}/about.json"
-                ) as resp:
-                    if resp.status != 200:
-                        return await ctx.send(f"https://http.cat/{resp.status}")
-                    result = await resp.json()
-            except (aiohttp.ClientError, asyncio.TimeoutError):
+            data = await self._fetch_user_about(username)
+            if data == TIMEOUT:
                 return await ctx.send("Operation timeout. Try again later.")
+            if isinstance(data, int):
+                return await ctx.send(f"https://http.cat/{data}")
 
-            data = result.get("data")
             if data.get("is_suspended"):
                 return await ctx.send("According to Reddit, that account has been suspended.")
 
@@ -188,6 +277,75 @@ class RedditInfo(commands.Cog):
             em.description = extra_info
         await ctx.send(profile_url, embed=em)
 
+    @commands.command(aliases=("bulkreddituser",))
+    @commands.mod_or_permissions(manage_messages=True)
+    @commands.bot_has_permissions(add_reactions=True, embed_links=True)
+    @commands.cooldown(1, 15, commands.BucketType.user)
+    async def redditusers(self, ctx: Context, *usernames: str):
+        """Fetch basic info about many Reddit user accounts at once.
+
+        Handy for checking a bunch of accounts during a raid. Accepts up to 100 usernames.
+        """
+        names = list(dict.fromkeys(u.lower().split("u/")[-1].strip("/ ") for u in usernames))
+        if not names:
+            return await ctx.send_help()
+        if len(names) > 100:
+            return await ctx.send("You can only look up to 100 Reddit accounts at once.")
+
+        semaphore = asyncio.Semaphore(5)
+
+        async def fetch(name: str) -> Union[int, Dict[str, Any]]:
+            async with semaphore:
+                return await self._fetch_user_about(name)
+
+        async with ctx.typing():
+            results = await asyncio.gather(*(fetch(name) for name in names))
+
+        rows = []
+        for name, data in zip(names, results):
+            if isinstance(data, int):
+                status = "not found" if data == 404 else f"error {data}"
+                rows.append(f"{name[:20]:<20}  {'-':>10}  {'-':>9}  {status}")
+                continue
+            notes = []
+            if data.get("is_suspended"):
+                notes.append("suspended")
+            if data.get("is_employee"):
+                notes.append("employee")
+            if data.get("is_mod"):
+                notes.append("mod")
+            if not data.get("has_verified_email"):
+                notes.append("unverified")
+            created = (
+                datetime.utcfromtimestamp(int(data["created_utc"])).strftime("%Y-%m-%d")
+                if data.get("created_utc") else "-"
+            )
+            karma = f"{data.get('total_karma', 0):,}" if not data.get("is_suspended") else "-"
+            rows.append(
+                f"{data.get('name', name)[:20]:<20}  {created:>10}  {karma:>9}  {', '.join(notes)}"
+            )
+
+        header = f"{'Username':<20}  {'Created':>10}  {'Karma':>9}  Notes"
+        pages = []
+        for i in range(0, len(rows), 15):
+            chunk = rows[i:i + 15]
+            page = box("\n".join([header, "-" * len(header), *chunk]), "prolog")
+            pages.append(f"{page}Page {i // 15 + 1} of {(len(rows) - 1) // 15 + 1}")
+        await menu(ctx, pages, DEFAULT_CONTROLS, timeout=90.0)
+
+    async def _fetch_user_about(self, username: str) -> Union[int, Dict[str, Any]]:
+        if (cached := self.users.get(username)) is not None:
+            return cached
+        result = await self.client.get(f"https://reddit.com/user/{username}/about.json")
+        if isinstance(result, int):
+            # a deleted account stays deleted, transient errors shouldn't stick around though
+            if result == 404:
+                self.users.put(username, result)
+            return result
+        data = result.get("data") or {}
+        self.users.put(username, data)
+        return data
+
     @commands.command(aliases=("subinfo", "subrinfo"))
     @commands.bot_has_permissions(embed_links=True)
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -197,15 +355,13 @@ class RedditInfo(commands.Cog):
         `more_info`: Shows some more info available for the subreddit. Defaults to False.
         """
         async with ctx.typing():
-            try:
-                async with self.session.get(f"https://reddit.com/r/{subreddit}/about.json") as resp:
-                    if resp.status != 200:
-                        return await ctx.send(f"https://http.cat/{resp.status}")
-                    result = await resp.json()
-            except (aiohttp.ClientError, asyncio.TimeoutError):
+            # subscriber and active user counts go stale fast, so refresh hourly here
+            data = await self._fetch_subreddit_about(subreddit, max_age=3600)
+            if data == TIMEOUT:
                 return await ctx.send("Operation timeout. Try again later.")
+            if isinstance(data, int):
+                return await ctx.send(f"https://http.cat/{data}")
 
-            data = result.get("data")
             if data and data.get("dist") == 0:
                 return await ctx.send("No subreddits were found from given name.")
             if data.get("over18") and not ctx.channel.is_nsfw():
@@ -257,17 +413,15 @@ class RedditInfo(commands.Cog):
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def random_hot_meme(self, ctx: Context):
         """Fetch a random hot meme, or a boring cringe one!"""
+        if await self._send_pooled_post(ctx, "memes"):
+            return
         async with ctx.typing():
             random_sub = random.choice(MEME_REDDITS)
-            try:
-                async with self.session.get(
-                    f"https://reddit.com/r/{random_sub}/hot.json?limit=20"
-                ) as resp:
-                    if resp.status != 200:
-                        return await ctx.send(f"https://http.cat/{resp.status}.jpg")
-                    data = await resp.json()
-            except (aiohttp.ClientError, asyncio.TimeoutError):
+            data = await self.client.get(f"https://reddit.com/r/{random_sub}/hot.json?limit=20")
+            if data == TIMEOUT:
                 return await ctx.send("Operation timeout. Try again later.")
+            if isinstance(data, int):
+                return await ctx.send(f"https://http.cat/{data}.jpg")
 
         embed = await self._fetch_random_post(data, ctx.channel, ctx=ctx)
         if not embed:
@@ -279,17 +433,15 @@ class RedditInfo(commands.Cog):
     @commands.cooldown(1, 5, commands.BucketType.user)
     async def interesting(self, ctx: Context):
         """Responds with random interesting reddit post."""
+        if await self._send_pooled_post(ctx, "interesting"):
+            return
         random_sub = random.choice(INTERESTING_SUBS)
         async with ctx.typing():
-            try:
-                async with self.session.get(
-                    f"https://reddit.com/r/{random_sub}/hot.json?limit=10"
-                ) as resp:
-                    if resp.status != 200:
-                        return await ctx.send(f"https://http.cat/{resp.status}.jpg")
-                    data = await resp.json()
-            except (aiohttp.ClientError, asyncio.TimeoutError):
+            data = await self.client.get(f"https://reddit.com/r/{random_sub}/hot.json?limit=10")
+            if data == TIMEOUT:
                 return await ctx.send("Operation timeout. Try again later.")
+            if isinstance(data, int):
+                return await ctx.send(f"https://http.cat/{data}.jpg")
 
         embed = await self._fetch_random_post(data, ctx.channel, ctx=ctx)
         if not embed:
@@ -308,16 +460,13 @@ class RedditInfo(commands.Cog):
                 "utm_medium": "desktop",
                 "utm_name": "random_link"
             }
-            try:
-                async with self.session.get(
-                    f"https://reddit.com/r/{subreddit_name}/.json",
-                    params=params
-                ) as resp:
-                    if resp.status != 200:
-                        return await ctx.send(f"https://http.cat/{resp.status}.jpg")
-                    data = await resp.json()
-            except (aiohttp.ClientError, asyncio.TimeoutError):
+            data = await self.client.get(
+                f"https://reddit.com/r/{subreddit_name}/.json", params=params
+            )
+            if data == TIMEOUT:
                 return await ctx.send("Operation timeout. Try again later.")
+            if isinstance(data, int):
+                return await ctx.send(f"https://http.cat/{data}.jpg")
 
         embed = await self._fetch_random_post(data, ctx.channel, ctx=ctx)
         if not embed:
@@ -325,17 +474,24 @@ class RedditInfo(commands.Cog):
         await ctx.send(embed=embed)
 
     async def _fetch_subreddit_icon(self, subreddit: str) -> str:
-        url = f"https://reddit.com/r/{subreddit}/about.json"
-        try:
-            async with self.session.get(url) as resp:
-                if resp.status != 200:
-                    return "https://i.imgur.com/DSBOK0P.png"
-                data = (await resp.json()).get("data") or {}
-                if not (data.get("icon_img") or data.get("community_icon")):
-                    return "https://i.imgur.com/DSBOK0P.png"
-                return data.get("icon_img") or data.get("community_icon").split("?")[0]
-        except (AttributeError, aiohttp.ClientError, asyncio.TimeoutError):
-            return "https://i.imgur.com/DSBOK0P.png"
+        data = await self._fetch_subreddit_about(subreddit)
+        if isinstance(data, int):
+            return DEFAULT_ICON
+        return self.subreddits.icon(data)
+
+    async def _fetch_subreddit_about(
+        self, subreddit: str, *, max_age: Optional[float] = None
+    ) -> Union[int, Dict[str, Any]]:
+        if (cached := self.subreddits.get(subreddit, max_age=max_age)) is not None:
+            return cached
+        result = await self.client.get(f"https://reddit.com/r/{subreddit}/about.json")
+        if isinstance(result, int):
+            return result
+        data = result.get("data") or {}
+        # non-existent subreddits come back as an empty search listing, don't cache those
+        if result.get("kind") == "t5":
+            self.subreddits.put(subreddit, data)
+        return data
 
     async def _fetch_random_post(self, result: dict, channel, **kwargs) -> Optional[discord.Embed]:
         ctx_or_channel = kwargs.get("ctx") or channel
@@ -359,14 +515,21 @@ class RedditInfo(commands.Cog):
             await ctx_or_channel.send("NSFW meme found. Aborted in SFW channel.")
             return None
 
+        if not self._is_image_post(meme):
+            await ctx_or_channel.send(f"https://reddit.com{meme.get('permalink', '')}")
+            return None
+        return await self._build_post_embed(meme)
+
+    @staticmethod
+    def _is_image_post(meme: Dict[str, Any]) -> bool:
         img_types = ("jpg", "jpeg", "png", "gif")
-        if (
+        return not (
             meme.get("is_video")
             or (meme.get("url") and "v.redd.it" in meme.get("url"))
             or (meme.get("url") and not meme.get("url").endswith(img_types))
-        ):
-            await ctx_or_channel.send(f"https://reddit.com{meme.get('permalink', '')}")
-            return None
+        )
+
+    async def _build_post_embed(self, meme: Dict[str, Any]) -> discord.Embed:
         emb = discord.Embed(colour=discord.Colour.random())
         emb.timestamp = datetime.utcfromtimestamp(int(meme["created_utc"]))
         emb.set_author(
@@ -403,17 +566,14 @@ class RedditInfo(commands.Cog):
         Provide the valid subreddit name without `/r/` prefix or any formatting.
         """
         await ctx.typing()
-        try:
-            async with self.session.get(f"https://reddit.com/r/{subreddit}/about.json") as resp:
-                if resp.status != 200:
-                    return await ctx.send(f"https://http.cat/{resp.status}")
-                result = await resp.json()
-        except (aiohttp.ClientError, asyncio.TimeoutError):
+        data = await self._fetch_subreddit_about(subreddit)
+        if data == TIMEOUT:
             return await ctx.send(
                 "Timeout while trying to query subreddit by given name. Try again later."
             )
+        if isinstance(data, int):
+            return await ctx.send(f"https://http.cat/{data}")
 
-        data = result.get("data")
         if data and data.get("dist") == 0:
             return await ctx.send("No subreddits were found from given name.")
         if data.get("over18") and not ctx.channel.is_nsfw():
@@ -505,3 +665,37 @@ class RedditInfo(commands.Cog):
         await self.config.interval.set(delay)
         await ctx.send(f"✅ Done. Changed interval for auto post feed to {delay} minutes!")
         await ctx.tick()
+
+    @commands.is_owner()
+    @commands.command(hidden=True)
+    async def redditratelimit(self, ctx: Context):
+        """Show the current Reddit API ratelimit budget used by this cog."""
+        await ctx.send(box(str(self.client.stats), "yaml"))
+
+    @commands.is_owner()
+    @commands.command(hidden=True)
+    @commands.bot_has_permissions(embed_links=True)
+    async def reddithealth(self, ctx: Context):
+        """Show timings, errors and skipped channels of the autopost loops."""
+        interval: int = await self.config.interval()
+        em = discord.Embed(colour=await ctx.embed_colour(), title="RedditInfo health")
+        em.description = f"Autopost interval: **{interval}** minutes"
+        for name, tick in self.tick_stats.items():
+            em.add_field(name=f"{name} loop", value=str(tick), inline=False)
+        em.add_field(
+            name="Reddit HTTP latency", value=box(str(self.client.latency)), inline=False
+        )
+        em.add_field(name="Ratelimit", value=box(str(self.client.stats), "yaml"), inline=False)
+        skipped = [
+            f"{channel_id}: {reason}"
+            for tick in self.tick_stats.values()
+            for channel_id, reason in tick.skipped.items()
+        ]
+        if skipped:
+            text = "\n".join(skipped)
+            em.add_field(
+                name=f"Skipped channels ({len(skipped)})",
+                value=box(text[:990] + ("\n..." if len(text) > 990 else "")),
+                inline=False,
+            )
+        await ctx.send(embed=em)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+def error_category(status: int) -> str:
+    if status == 408:
+        return "timeout"
+    if status == 429:
+        return "ratelimited"
+    if status in (403, 404):
+        return "forbidden/not found"
+    if status >= 500:
+        return "reddit server error"
+    return f"http {status}"
+
+
+class LatencyHistogram:
+    """Fixed bucket histogram of request latencies, in seconds."""
+
+    BOUNDS: Tuple[float, ...] = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0.0
+
+    def __len__(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.total += seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bucket bound holding the q-th percentile, ``inf`` if it's in the overflow bucket."""
+        count = len(self)
+        if not count:
+            return None
+        rank, seen = q * count, 0
+        for bound, bucket in zip(self.BOUNDS + (float("inf"),), self.counts):
+            seen += bucket
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def __str__(self) -> str:
+        count = len(self)
+        if not count:
+            return "No requests made yet."
+        peak = max(self.counts)
+        labels = [f"<= {b}s" for b in self.BOUNDS] + [f" > {self.BOUNDS[-1]}s"]
+        lines = [
+            f"{label:>8} | {'#' * round(20 * n / peak):<20} {n:,}"
+            for label, n in zip(labels, self.counts)
+        ]
+        lines.append(f"avg {self.total / count:.3f}s over {count:,} requests")
+        return "\n".join(lines)
+
+
+@dataclass
+class TickStats:
+    name: str
+    runs: int = 0
+    last_run: Optional[float] = None
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    total_duration: float = 0.0
+    sent: int = 0
+    errors: Counter = field(default_factory=Counter)
+    # only the skips from the last finished tick, so this never grows unbounded
+    skipped: Dict[int, str] = field(default_factory=dict)
+    _skipping: Dict[int, str] = field(default_factory=dict, repr=False)
+
+    @contextlib.contextmanager
+    def measure(self) -> Iterator[TickStats]:
+        self._skipping = {}
+        self.last_run = time.time()
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.runs += 1
+            self.last_duration = time.perf_counter() - started
+            self.max_duration = max(self.max_duration, self.last_duration)
+            self.total_duration += self.last_duration
+            self.skipped = self._skipping
+
+    def skip(self, channel_id: int, reason: str) -> None:
+        self._skipping[channel_id] = reason
+
+    def error(self, category: str) -> None:
+        self.errors[category] += 1
+
+    def __str__(self) -> str:
+        if not self.runs:
+            return "Has not run yet."
+        errors = ", ".join(f"{k}: {v:,}" for k, v in self.errors.most_common()) or "none"
+        return (
+            f"Runs:  {self.runs:,} (last <t:{int(self.last_run or 0)}:R>)\n"
+            f"Duration:  last {self.last_duration:.2f}s, "
+            f"avg {self.total_duration / self.runs:.2f}s, max {self.max_duration:.2f}s\n"
+            f"Posts sent:  {self.sent:,}\n"
+            f"Errors:  {errors}\n"
+            f"Channels skipped last tick:  {len(self.skipped):,}"
+        )
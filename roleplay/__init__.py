@@ -2,7 +2,11 @@ from discord.utils import maybe_coroutine
 
 from .roleplay import Roleplay
 
-__red_end_user_data_statement__ = "This cog does not persistently store any PII data or metadata about users."
+__red_end_user_data_statement__ = (
+    "This cog stores how many times each user used or received each roleplay action,"
+    " per server and globally, and per server which members they used actions on"
+    " and received actions from."
+)
 
 
 async def setup(bot):
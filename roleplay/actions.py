@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+from .constants import (
+    BAKA,
+    BITE,
+    BULLY,
+    CRY,
+    CRY_STRINGS,
+    CUDDLE,
+    FEED,
+    HIGHFIVE,
+    HUG,
+    KILL,
+    KISS,
+    LICK,
+    PAT,
+    POKE,
+    PUNCH,
+    PUNCH_STRINGS,
+    RECIPES,
+    SLAP,
+    SMUG,
+    TICKLE,
+)
+
+NO_U = "**Ｎ Ｏ   Ｕ**"
+
+
+@dataclass(frozen=True)
+class RoleplayAction:
+    """Declarative description of one roleplay command.
+
+    Every text is a ``str.format`` template which can use these fields:
+
+    - ``{author}`` / ``{author_bold}`` / ``{author_mention}`` for the command invoker
+    - ``{member}`` (mention) / ``{member_name}`` for the target member
+    - ``{them}``, which is "I" when the bot is the target, else the member's name
+    - ``{sent}`` / ``{received}`` (or ``{count}`` for solo actions), the new counts
+    - ``{extra}``, a random pick from ``strings``
+    """
+
+    name: str
+    # key into counters.ACTIONS
+    action: str
+    gifs: Sequence[str]
+    message: str
+    footer: str
+    cooldown: int = 10
+    strings: Sequence[str] = field(default_factory=tuple)
+    # solo actions don't take a member, e.g. cry and smug
+    solo: bool = False
+    # put the message in the embed description instead of the message content
+    in_description: bool = False
+    # targeting yourself: reply and stop, or go ahead with a different message
+    self_reply: Optional[str] = None
+    self_message: Optional[str] = None
+    # targeting the bot: reply and stop (optionally with a GIF), or go ahead
+    bot_reply: Optional[str] = None
+    bot_reply_gif: Optional[str] = None
+    bot_message: Optional[str] = None
+    bot_gif: Optional[str] = None
+
+
+ROLEPLAY_ACTIONS: Dict[str, RoleplayAction] = {
+    action.name: action
+    for action in (
+        RoleplayAction(
+            name="baka",
+            action="BAKAS",
+            gifs=BAKA,
+            message="_**{author}** calls {member} a BAKA bahahahahaha!!!_",
+            footer=(
+                "{author} used baka: {sent} times so far.\n"
+                "{member_name} got called a BAKA: {received} times so far."
+            ),
+            bot_reply=NO_U,
+            self_reply="{author_bold}, you really are BAKA. Stupid!! 💩",
+        ),
+        RoleplayAction(
+            name="bully",
+            action="BULLY",
+            gifs=BULLY,
+            cooldown=60,
+            message="_**{author}** bullies {member}_ 🤡",
+            footer=(
+                "{author} bullied: {sent} times so far.\n"
+                "{member_name} got bullied: {received} times so far.\n"
+                "Someone call police to get {author} arrested."
+            ),
+            bot_reply=NO_U,
+            self_reply=(
+                "{author_mention} Self bullying doesn't make sense. Stop it, get some help."
+            ),
+        ),
+        RoleplayAction(
+            name="cry",
+            action="CRY",
+            gifs=CRY,
+            strings=CRY_STRINGS,
+            solo=True,
+            in_description=True,
+            message="{author_mention} {extra}",
+            footer="{author} has cried {count} times in this server so far.",
+        ),
+        RoleplayAction(
+            name="cuddle",
+            action="CUDDLES",
+            gifs=CUDDLE,
+            message="_**{author}** cuddles_ {member}",
+            footer=(
+                "{author} sent: {sent} cuddles so far.\n"
+                "{them} received: {received} cuddles so far."
+            ),
+            self_reply=(
+                "{author_mention} According to all known laws of roleplay, "
+                "there is no way you can cuddle yourself! Go cuddle with "
+                "someone... or a pillow, if you're lonely like me. 😔"
+            ),
+            bot_message="Awww thanks for cuddles, {author_bold}! Very kind of you. 😳",
+        ),
+        RoleplayAction(
+            name="feed",
+            action="FEEDS",
+            gifs=FEED,
+            strings=RECIPES,
+            message="_**{author}** feeds {member} some delicious food!_",
+            footer=(
+                "{author} have fed others: {sent} times so far.\n"
+                "{them} received some food: {received} times so far."
+            ),
+            self_reply="_{author_mention} eats **{extra}**!_",
+            bot_message="OWO! Thanks for yummy food..., {author_bold}! ❤️",
+        ),
+        RoleplayAction(
+            name="highfive",
+            action="HIGHFIVES",
+            gifs=HIGHFIVE,
+            message="_**{author}** high fives_ {member}",
+            footer=(
+                "{author} sent: {sent} high-fives so far.\n"
+                "{them} received: {received} high-fives so far."
+            ),
+            self_reply="_{author_mention} high-fives themselves in mirror, I guess?_",
+            bot_message="_high-fives back to {author_bold}_ 👀",
+            bot_gif="https://i.imgur.com/hQPCYUJ.gif",
+        ),
+        RoleplayAction(
+            name="hug",
+            action="HUGS",
+            gifs=HUG,
+            message="_**{author}** hugs_ {member} 🤗",
+            footer=(
+                "{author} gave: {sent} hugs so far.\n"
+                "{them} received: {received} hugs so far!"
+            ),
+            self_reply="{author_mention} One dOEs NOt SiMplY hUg THeIR oWn sELF!!!!!",
+            bot_message="Awwww thanks! So nice of you! _hugs **{author}** back_ 🤗",
+        ),
+        RoleplayAction(
+            name="kill",
+            action="KILLS",
+            gifs=KILL,
+            cooldown=60,
+            message="_**{author}** tries to kill {member}!_ 🇫",
+            footer=(
+                "{author} attempted: {sent} kills so far.\n"
+                "{member_name} got killed: {received} times so far!"
+            ),
+            bot_reply=NO_U,
+            self_reply="{author_mention} Seppukku is not allowed on my watch. 💀",
+        ),
+        RoleplayAction(
+            name="kiss",
+            action="KISSES",
+            gifs=KISS,
+            message="_**{author}** kisses_ {member} 😘 🥰",
+            footer=(
+                "{author} sent: {sent} kisses so far.\n"
+                "{member_name} received: {received} kisses so far!"
+            ),
+            self_reply="Poggers {author_bold}, you just kissed yourself! LOL!!! 💋",
+            bot_message="Awwww so nice of you! _kisses **{author}** back!_ 😘 🥰",
+        ),
+        RoleplayAction(
+            name="lick",
+            action="LICKS",
+            gifs=LICK,
+            message="_**{author}** licks_ {member} 😳",
+            footer=(
+                "{author} have licked others: {sent} times so far.\n"
+                "{member_name} got licked: {received} times so far!"
+            ),
+            bot_reply="{author_mention} You wanna lick a bot? Very horny! Here, lick this: 🍆",
+            self_message="{author_mention} Poggers, you just licked yourself. 👏",
+        ),
+        RoleplayAction(
+            name="nom",
+            action="NOMS",
+            gifs=BITE,
+            message="_**{author}** casually noms_ {member} 😈",
+            footer=(
+                "{author} nom'd: {sent} times so far.\n"
+                "{member_name} received: {received} noms so far!"
+            ),
+            bot_reply="**OH NO!** _runs away_",
+            self_message="Waaaaaa! {author_bold}, You bit yourself! Whyyyy?? 😭",
+        ),
+        RoleplayAction(
+            name="pat",
+            action="PATS",
+            gifs=PAT,
+            message="_**{author}** pats_ {member}",
+            footer=(
+                "{author} gave: {sent} pats so far.\n"
+                "{them} received: {received} pats so far!"
+            ),
+            self_reply="{author_mention} _pats themselves, I guess? **yay**_ 🎉",
+            bot_message="Wowie! Thanks {author_bold} for giving me pats. 😳 😘",
+        ),
+        RoleplayAction(
+            name="poke",
+            action="POKES",
+            gifs=POKE,
+            message="_**{author}** casually pokes_ {member}",
+            footer=(
+                "{author} gave: {sent} pokes so far.\n"
+                "{them} received: {received} pokes so far!"
+            ),
+            self_reply="{author_bold} wants to play self poke huh?!",
+            bot_message="Awwww! Hey there. _pokes **{author}** back!_",
+        ),
+        RoleplayAction(
+            name="punch",
+            action="PUNCHES",
+            gifs=PUNCH,
+            strings=PUNCH_STRINGS,
+            cooldown=60,
+            message="_**{author}** {extra}_ {member}",
+            footer=(
+                "{author} sent: {sent} punches so far.\n"
+                "{member_name} received: {received} punches so far!"
+            ),
+            bot_reply=(
+                "{author_mention} tried to punch a bot but failed miserably,\n"
+                "and they actually punched themselves instead.\n"
+                "How disappointing LMFAO! 😂 😂 😂"
+            ),
+            bot_reply_gif="https://i.imgur.com/iVgOijZ.gif",
+            self_reply=(
+                "I uh ..... **{author}**, self harm does"
+                " not sound so fun. Stop it, get some help."
+            ),
+        ),
+        RoleplayAction(
+            name="slap",
+            action="SLAPS",
+            gifs=SLAP,
+            cooldown=60,
+            message="_**{author}** slaps_ {member}",
+            footer=(
+                "{author} gave: {sent} slaps so far.\n"
+                "{member_name} received: {received} slaps so far!"
+            ),
+            bot_reply=NO_U,
+            self_reply="{author_mention} Don't slap yourself, you're precious!",
+        ),
+        RoleplayAction(
+            name="smug",
+            action="SMUG",
+            gifs=SMUG,
+            solo=True,
+            message="_**{author}** smugs at **@\u200bsomeone**_ 😏",
+            footer="{author} has smugged {count} times in this server so far.",
+        ),
+        RoleplayAction(
+            name="tickle",
+            action="TICKLES",
+            gifs=TICKLE,
+            message="_**{author}** tickles_ {member}",
+            footer=(
+                "{author} tickled others: {sent} times so far.\n"
+                "{them} received: {received} tickles so far!"
+            ),
+            self_reply=(
+                "{author_mention} tickling yourself is boring!"
+                " Tickling others is more fun though, right? 😏"
+            ),
+            bot_message="_Wow, nice tickling skills, {author_bold}. I LOL'd._ 🤣 🤡",
+            bot_gif="https://i.imgur.com/6jr50Fp.gif",
+        ),
+    )
+}
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, DefaultDict, Dict, List, Mapping, Optional, Tuple
+
+from redbot.core import Config
+from redbot.core.config import Group
+
+logger = logging.getLogger("red.owo.roleplay")
+
+# (guild_id, user_id) for per server member stats, (user_id,) for global user stats
+Scope = Tuple[int, ...]
+
+# Stats are stored as one flat int vector per member/user, two slots per action.
+# Order is part of the storage format: only ever append new actions at the end!
+ACTIONS: Tuple[str, ...] = (
+    "BAKAS",
+    "BULLY",
+    "CUDDLES",
+    "CRY",
+    "FEEDS",
+    "HIGHFIVES",
+    "HUGS",
+    "KILLS",
+    "KISSES",
+    "LICKS",
+    "NOMS",
+    "PATS",
+    "POKES",
+    "PUNCHES",
+    "SLAPS",
+    "SMUG",
+    "TICKLES",
+)
+SENT, RECEIVED = 0, 1
+VECTOR_SIZE = len(ACTIONS) * 2
+# solo actions like cry and smug only use their SENT slot
+SOLO_ACTIONS = {"CRY": "CRY_COUNT", "SMUG": "SMUG_COUNT"}
+# command name -> action, used to look up actions from user input
+COMMAND_ACTIONS = {
+    "baka": "BAKAS",
+    "bully": "BULLY",
+    "cuddle": "CUDDLES",
+    "cry": "CRY",
+    "feed": "FEEDS",
+    "highfive": "HIGHFIVES",
+    "hug": "HUGS",
+    "kill": "KILLS",
+    "kiss": "KISSES",
+    "lick": "LICKS",
+    "nom": "NOMS",
+    "pat": "PATS",
+    "poke": "POKES",
+    "punch": "PUNCHES",
+    "slap": "SLAPS",
+    "smug": "SMUG",
+    "tickle": "TICKLES",
+}
+
+
+def find_action(name: str) -> Optional[str]:
+    name = name.lower().strip()
+    if name in COMMAND_ACTIONS:
+        return COMMAND_ACTIONS[name]
+    return name.upper() if name.upper() in ACTIONS else None
+
+
+def slot(action: str, direction: int = SENT) -> int:
+    return ACTIONS.index(action) * 2 + direction
+
+
+def pack(vector: List[int]) -> List[int]:
+    """Strip trailing zeros in place, most people only ever use a few actions."""
+    while vector and not vector[-1]:
+        vector.pop()
+    return vector
+
+
+def unpack(stored: List[int]) -> List[int]:
+    return list(stored) + [0] * (VECTOR_SIZE - len(stored))
+
+
+def from_legacy(data: Mapping[str, Any]) -> List[int]:
+    """Convert schema version 1 named counters (``HUGS_SENT`` etc.) into a stats vector."""
+    vector = [0] * VECTOR_SIZE
+    for i, action in enumerate(ACTIONS):
+        if action in SOLO_ACTIONS:
+            vector[i * 2 + SENT] = int(data.get(SOLO_ACTIONS[action]) or 0)
+            continue
+        vector[i * 2 + SENT] = int(data.get(f"{action}_SENT") or 0)
+        vector[i * 2 + RECEIVED] = int(data.get(f"{action}_RECEIVED") or 0)
+    return vector
+
+
+def to_legacy(vector: List[int]) -> Dict[str, int]:
+    data = {}
+    for i, action in enumerate(ACTIONS):
+        if action in SOLO_ACTIONS:
+            data[SOLO_ACTIONS[action]] = vector[i * 2 + SENT]
+            continue
+        data[f"{action}_SENT"] = vector[i * 2 + SENT]
+        data[f"{action}_RECEIVED"] = vector[i * 2 + RECEIVED]
+    return data
+
+
+class CounterStore:
+    """Write-behind cache for roleplay action counters.
+
+    Stats vectors are loaded from Config once per member/user and incremented
+    in memory without awaiting in between the read and the write, so concurrent
+    commands can't lose increments. The increments are buffered as deltas and
+    added onto Config in batches by :meth:`flush`. Nothing is loaded until
+    :attr:`ready` is set, which happens once the storage migration has finished.
+    """
+
+    def __init__(self, config: Config, *, idle_ttl: float = 3600.0) -> None:
+        self.config = config
+        self.idle_ttl = idle_ttl
+        self.ready = asyncio.Event()
+        self._values: Dict[Scope, List[int]] = {}
+        self._last_used: Dict[Scope, float] = {}
+        self._pending: DefaultDict[Scope, Counter] = defaultdict(Counter)
+        self._locks: Dict[Scope, asyncio.Lock] = {}
+        self._flush_lock = asyncio.Lock()
+        # called as listener(scope, slot, new_count) after every increment
+        self.listeners: List[Callable[[Scope, int, int], None]] = []
+
+    @staticmethod
+    def member(guild_id: int, user_id: int) -> Scope:
+        return (guild_id, user_id)
+
+    @staticmethod
+    def user(user_id: int) -> Scope:
+        return (user_id,)
+
+    @classmethod
+    def action_updates(
+        cls, guild_id: int, sender: int, receiver: int, action: str
+    ) -> Tuple[Tuple[Scope, int], ...]:
+        """The ``(scope, slot)`` pairs one use of ``action`` on another member increments."""
+        return (
+            (cls.member(guild_id, sender), slot(action, SENT)),
+            (cls.member(guild_id, receiver), slot(action, RECEIVED)),
+            (cls.user(sender), slot(action, SENT)),
+            (cls.user(receiver), slot(action, RECEIVED)),
+        )
+
+    def _group(self, scope: Scope) -> Group:
+        if len(scope) == 2:
+            return self.config.member_from_ids(*scope)
+        return self.config.user_from_id(scope[0])
+
+    @property
+    def pending(self) -> int:
+        return sum(len(deltas) for deltas in self._pending.values())
+
+    async def _load(self, scope: Scope) -> List[int]:
+        self._last_used[scope] = time.monotonic()
+        if (values := self._values.get(scope)) is not None:
+            return values
+        await self.ready.wait()
+        lock = self._locks.setdefault(scope, asyncio.Lock())
+        async with lock:
+            if scope not in self._values:
+                self._values[scope] = unpack(await self._group(scope).stats())
+        self._locks.pop(scope, None)
+        return self._values[scope]
+
+    async def get(self, scope: Scope) -> List[int]:
+        return list(await self._load(scope))
+
+    async def increment(self, *updates: Tuple[Scope, int]) -> List[int]:
+        """Add 1 to each ``(scope, slot)`` pair and return the new counts in the same order."""
+        for scope, _ in updates:
+            await self._load(scope)
+        # everything is in memory now, no awaits past this point keeps it atomic
+        counts = []
+        for scope, index in updates:
+            values = self._values[scope]
+            values[index] += 1
+            self._pending[scope][index] += 1
+            counts.append(values[index])
+            for listener in self.listeners:
+                listener(scope, index, values[index])
+        return counts
+
+    def cached(self, guild_id: Optional[int] = None) -> Dict[int, List[int]]:
+        """In-memory stats of a guild's members, or of all users if ``guild_id`` is None.
+
+        These are always at least as fresh as what Config has stored.
+        """
+        if guild_id is None:
+            return {scope[0]: values for scope, values in self._values.items() if len(scope) == 1}
+        return {
+            scope[1]: values
+            for scope, values in self._values.items()
+            if len(scope) == 2 and scope[0] == guild_id
+        }
+
+    async def flush(self) -> int:
+        """Write all buffered deltas to Config and return how many scopes were written."""
+        async with self._flush_lock:
+            pending, self._pending = self._pending, defaultdict(Counter)
+            for scope, deltas in pending.items():
+                try:
+                    async with self._group(scope).stats() as stored:
+                        stored.extend([0] * (VECTOR_SIZE - len(stored)))
+                        for index, delta in deltas.items():
+                            stored[index] += delta
+                        pack(stored)
+                except Exception:
+                    logger.exception(f"Failed to flush roleplay counters for {scope}, will retry")
+                    self._pending[scope].update(deltas)
+            self._evict_idle()
+            return len(pending)
+
+    async def forget_user(self, user_id: int) -> None:
+        """Drop a user's cached and buffered counters and delete their stored stats."""
+        async with self._flush_lock:
+            for scope in [s for s in {*self._values, *self._pending} if s[-1] == user_id]:
+                self._values.pop(scope, None)
+                self._pending.pop(scope, None)
+                self._last_used.pop(scope, None)
+            await self.config.user_from_id(user_id).stats.clear()
+            for guild_id, members in (await self.config.all_members()).items():
+                if user_id in members:
+                    await self.config.member_from_ids(guild_id, user_id).stats.clear()
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_ttl
+        for scope, last_used in list(self._last_used.items()):
+            if last_used < cutoff and scope not in self._pending:
+                self._values.pop(scope, None)
+                del self._last_used[scope]
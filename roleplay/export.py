@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import csv
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+from .counters import ACTIONS, RECEIVED, SENT, SOLO_ACTIONS, VECTOR_SIZE, unpack
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW = True
+except ImportError:
+    PYARROW = False
+
+EXPORT_FORMATS = ("csv", "parquet")
+# members whose stats are read from Config at a time while exporting
+READ_BATCH = 1000
+
+# (column name, stats slot), solo actions only ever count as sent
+COLUMNS: List[Tuple[str, int]] = []
+for _i, _action in enumerate(ACTIONS):
+    if _action in SOLO_ACTIONS:
+        COLUMNS.append((_action.lower(), _i * 2 + SENT))
+        continue
+    COLUMNS.append((f"{_action.lower()}_sent", _i * 2 + SENT))
+    COLUMNS.append((f"{_action.lower()}_received", _i * 2 + RECEIVED))
+
+Row = Tuple[int, Sequence[int]]
+
+
+def _chunks(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _write_csv(path: Path, chunks: Iterable[List[Row]]) -> None:
+    with path.open("w", encoding="utf-8", newline="") as fp:
+        writer = csv.writer(fp)
+        writer.writerow(["user_id", *(name for name, _ in COLUMNS)])
+        for chunk in chunks:
+            writer.writerows(
+                [user_id, *(stats[i] for _, i in COLUMNS)] for user_id, stats in chunk
+            )
+
+
+def _write_parquet(path: Path, chunks: Iterable[List[Row]]) -> None:
+    schema = pa.schema(
+        [("user_id", pa.uint64()), *((name, pa.uint32()) for name, _ in COLUMNS)]
+    )
+    with pq.ParquetWriter(str(path), schema, compression="zstd") as writer:
+        # one row group per chunk, each built column by column
+        for chunk in chunks:
+            columns = [[user_id for user_id, _ in chunk]]
+            columns.extend([stats[i] for _, stats in chunk] for _, i in COLUMNS)
+            arrays = [pa.array(col, type=f.type) for col, f in zip(columns, schema)]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+
+
+def write_export(
+    path: Path, fmt: str, rows: Iterable[Row], *, chunk_size: int = 5000
+) -> Tuple[int, List[int]]:
+    """Write ``(user_id, stats)`` rows to ``path`` in ``chunk_size`` batches.
+
+    Members without any stats are skipped. Returns how many rows were written
+    and the per slot totals, both counted while the rows stream through.
+    Blocking, so run it in an executor.
+    """
+    if fmt == "parquet" and not PYARROW:
+        raise RuntimeError("Parquet exports need pyarrow installed.")
+    written = 0
+    totals = [0] * VECTOR_SIZE
+
+    def counted() -> Iterator[Row]:
+        nonlocal written
+        for user_id, stats in rows:
+            stats = unpack(stats)
+            if not any(stats):
+                continue
+            written += 1
+            for i, value in enumerate(stats):
+                totals[i] += value
+            yield user_id, stats
+
+    writer = _write_parquet if fmt == "parquet" else _write_csv
+    writer(path, _chunks(counted(), chunk_size))
+    return written, totals
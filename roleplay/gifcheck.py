@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from random import choice
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import aiohttp
+
+logger = logging.getLogger("red.owo.roleplay")
+
+# status used when the host couldn't be reached at all
+UNREACHABLE = 0
+
+
+@dataclass
+class GifStatus:
+    status: int
+    size: Optional[int]
+    checked_at: float
+
+    @property
+    def healthy(self) -> bool:
+        return 200 <= self.status < 400
+
+
+class GifHealthIndex:
+    """Tracks which roleplay GIF URLs still work, so embeds don't end up empty.
+
+    URLs are checked with HEAD requests (GET for hosts that refuse HEAD),
+    at most ``concurrency`` at a time and no more than ``rate`` per second.
+    Results are kept in a small JSON file in the cog's data folder.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        concurrency: int = 10,
+        rate: float = 10.0,
+        healthy_ttl: float = 7 * 86400,
+        dead_ttl: float = 86400,
+    ) -> None:
+        self.path = path
+        self.concurrency = concurrency
+        self.rate = rate
+        self.healthy_ttl = healthy_ttl
+        self.dead_ttl = dead_ttl
+        self.results: Dict[str, GifStatus] = {}
+        self._healthy_pools: Dict[int, List[str]] = {}
+        self._next_slot = 0.0
+        self._slot_lock = asyncio.Lock()
+
+    def load(self) -> None:
+        try:
+            with self.path.open(encoding="utf-8") as fp:
+                raw = json.load(fp)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logger.warning("Could not read roleplay GIF health index, starting fresh.")
+            return
+        self.results = {url: GifStatus(*entry) for url, entry in raw.items()}
+        self._healthy_pools.clear()
+
+    def save(self) -> None:
+        raw = {url: [r.status, r.size, r.checked_at] for url, r in self.results.items()}
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            with tmp.open("w", encoding="utf-8") as fp:
+                json.dump(raw, fp, separators=(",", ":"))
+            tmp.replace(self.path)
+        except OSError:
+            logger.exception("Failed to write roleplay GIF health index!")
+
+    def is_dead(self, url: str) -> bool:
+        result = self.results.get(url)
+        return result is not None and not result.healthy
+
+    def pick(self, pool: Sequence[str]) -> str:
+        """Random GIF from the pool, skipping known dead ones. Unchecked URLs count as healthy."""
+        healthy = self._healthy_pools.get(id(pool))
+        if healthy is None:
+            healthy = self._healthy_pools[id(pool)] = [u for u in pool if not self.is_dead(u)]
+        # if literally everything is dead, an empty embed beats an exception
+        return choice(healthy or pool)
+
+    def dead(self) -> Dict[str, GifStatus]:
+        return {url: result for url, result in self.results.items() if not result.healthy}
+
+    def stale(self, urls: Iterable[str]) -> List[str]:
+        now = time.time()
+        stale = []
+        for url in dict.fromkeys(urls):
+            result = self.results.get(url)
+            ttl = self.healthy_ttl if result and result.healthy else self.dead_ttl
+            if result is None or now - result.checked_at > ttl:
+                stale.append(url)
+        return stale
+
+    async def _wait_for_slot(self) -> None:
+        async with self._slot_lock:
+            now = time.monotonic()
+            self._next_slot = max(self._next_slot, now) + 1 / self.rate
+            delay = self._next_slot - now - 1 / self.rate
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _check_one(self, session: aiohttp.ClientSession, url: str) -> GifStatus:
+        await self._wait_for_slot()
+        timeout = aiohttp.ClientTimeout(total=20)
+        try:
+            async with session.head(url, allow_redirects=True, timeout=timeout) as resp:
+                status, size, final_url = resp.status, resp.content_length, str(resp.url)
+            if status in (403, 405, 501):
+                # some CDNs don't do HEAD, a GET we never read the body of works just as well
+                async with session.get(url, timeout=timeout) as resp:
+                    status, size, final_url = resp.status, resp.content_length, str(resp.url)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return GifStatus(UNREACHABLE, None, time.time())
+        # imgur redirects deleted images to a placeholder instead of a 404
+        if "removed.png" in final_url:
+            status = 404
+        return GifStatus(status, size, time.time())
+
+    async def check(
+        self, session: aiohttp.ClientSession, urls: Iterable[str], *, force: bool = False
+    ) -> int:
+        """Check stale URLs (every URL with ``force``), returns how many were checked."""
+        todo = list(dict.fromkeys(urls)) if force else self.stale(urls)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(url: str) -> None:
+            async with semaphore:
+                self.results[url] = await self._check_one(session, url)
+
+        await asyncio.gather(*(run(url) for url in todo))
+        self._healthy_pools.clear()
+        if todo:
+            self.save()
+        return len(todo)
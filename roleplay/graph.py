@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Collection, DefaultDict, Dict, List, Optional, Set, Tuple
+
+from redbot.core import Config
+from redbot.core.config import Group
+
+from .counters import ACTIONS, RECEIVED, SENT, Scope
+
+logger = logging.getLogger("red.owo.roleplay")
+
+# (other user id, action index into counters.ACTIONS)
+Edge = Tuple[int, int]
+# [edges the member sent, edges the member received]
+Edges = Tuple[Dict[Edge, int], Dict[Edge, int]]
+
+FRIENDLY_ACTIONS = ("CUDDLES", "FEEDS", "HIGHFIVES", "HUGS", "KISSES", "PATS", "TICKLES")
+
+
+class InteractionGraph:
+    """Who did which roleplay action to whom, per guild.
+
+    Every member keeps at most ``max_edges`` edges per direction. Once full,
+    a new edge replaces the smallest one and starts from that edge's count
+    plus one (the Space-Saving algorithm), so pairs that keep interacting
+    make it into the table while one-off pairs churn at the bottom. Counts
+    of edges that replaced another one may be overestimated by at most the
+    count they inherited, which stays small next to real top pairs.
+
+    Like :class:`~.counters.CounterStore`, edges are changed in memory and
+    the members that changed are written to Config in batches by :meth:`flush`.
+    """
+
+    def __init__(self, config: Config, *, max_edges: int = 64, idle_ttl: float = 3600.0) -> None:
+        self.config = config
+        self.max_edges = max_edges
+        self.idle_ttl = idle_ttl
+        self._edges: Dict[Scope, Edges] = {}
+        self._last_used: Dict[Scope, float] = {}
+        self._dirty: Set[Scope] = set()
+        self._locks: Dict[Scope, asyncio.Lock] = {}
+        self._flush_lock = asyncio.Lock()
+
+    def _group(self, scope: Scope) -> Group:
+        return self.config.member_from_ids(*scope)
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    async def _load(self, scope: Scope) -> Edges:
+        self._last_used[scope] = time.monotonic()
+        if (edges := self._edges.get(scope)) is not None:
+            return edges
+        lock = self._locks.setdefault(scope, asyncio.Lock())
+        async with lock:
+            if scope not in self._edges:
+                stored = await self._group(scope).interactions()
+                self._edges[scope] = tuple(
+                    {(other, action): count for other, action, count in stored.get(key, [])}
+                    for key in ("sent", "received")
+                )
+        self._locks.pop(scope, None)
+        return self._edges[scope]
+
+    def _bump(self, edges: Dict[Edge, int], edge: Edge) -> None:
+        if edge in edges or len(edges) < self.max_edges:
+            edges[edge] = edges.get(edge, 0) + 1
+            return
+        smallest = min(edges, key=edges.__getitem__)
+        edges[edge] = edges.pop(smallest) + 1
+
+    async def record(self, guild_id: int, sender: int, receiver: int, action: str) -> None:
+        if sender == receiver:
+            return
+        sender_scope, receiver_scope = (guild_id, sender), (guild_id, receiver)
+        sent, _ = await self._load(sender_scope)
+        _, received = await self._load(receiver_scope)
+        # both sides are loaded, no awaits from here on
+        index = ACTIONS.index(action)
+        self._bump(sent, (receiver, index))
+        self._bump(received, (sender, index))
+        self._dirty.update((sender_scope, receiver_scope))
+
+    async def top(
+        self,
+        guild_id: int,
+        user_id: int,
+        direction: int,
+        actions: Optional[Collection[str]] = None,
+        n: Optional[int] = 5,
+    ) -> List[Tuple[int, int]]:
+        """Top ``(other user id, count)`` pairs of a member, summed over ``actions`` (all if None).
+
+        ``direction`` is ``counters.SENT`` for who the member acted on most,
+        ``counters.RECEIVED`` for who acted on them most.
+        """
+        edges = (await self._load((guild_id, user_id)))[direction]
+        wanted = None if actions is None else {ACTIONS.index(a) for a in actions}
+        totals: DefaultDict[int, int] = defaultdict(int)
+        for (other, index), count in edges.items():
+            if wanted is None or index in wanted:
+                totals[other] += count
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    async def best_friends(
+        self, guild_id: int, user_id: int, n: int = 5
+    ) -> List[Tuple[int, int]]:
+        """Members with the most friendly actions between them and the user, both ways."""
+        totals: DefaultDict[int, int] = defaultdict(int)
+        for direction in (SENT, RECEIVED):
+            pairs = await self.top(guild_id, user_id, direction, FRIENDLY_ACTIONS, None)
+            for other, count in pairs:
+                totals[other] += count
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    async def flush(self) -> int:
+        """Write every member whose edges changed to Config, returns how many were written."""
+        async with self._flush_lock:
+            dirty, self._dirty = self._dirty, set()
+            for scope in dirty:
+                sent, received = self._edges[scope]
+                data = {
+                    "sent": [[o, a, c] for (o, a), c in sent.items()],
+                    "received": [[o, a, c] for (o, a), c in received.items()],
+                }
+                try:
+                    await self._group(scope).interactions.set(data)
+                except Exception:
+                    logger.exception(
+                        f"Failed to flush roleplay interactions for {scope}, will retry"
+                    )
+                    self._dirty.add(scope)
+            self._evict_idle()
+            return len(dirty)
+
+    async def forget_user(self, user_id: int) -> None:
+        """Delete a user's edges and remove the user from every other member's edges."""
+        async with self._flush_lock:
+            for guild_id, members in (await self.config.all_members()).items():
+                for member_id, data in members.items():
+                    group = self.config.member_from_ids(guild_id, member_id)
+                    if member_id == user_id:
+                        await group.interactions.clear()
+                        continue
+                    stored = data.get("interactions") or {}
+                    kept = {
+                        key: [edge for edge in stored.get(key, []) if edge[0] != user_id]
+                        for key in ("sent", "received")
+                    }
+                    if kept != {key: stored.get(key, []) for key in ("sent", "received")}:
+                        await group.interactions.set(kept)
+            # no awaits from here on, members loaded above mustn't keep the user in memory
+            for scope in list(self._edges):
+                if scope[1] == user_id:
+                    del self._edges[scope]
+                    self._last_used.pop(scope, None)
+                    self._dirty.discard(scope)
+                    continue
+                for edges in self._edges[scope]:
+                    for edge in [edge for edge in edges if edge[0] == user_id]:
+                        del edges[edge]
+                        self._dirty.add(scope)
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_ttl
+        for scope, last_used in list(self._last_used.items()):
+            if last_used < cutoff and scope not in self._dirty:
+                self._edges.pop(scope, None)
+                del self._last_used[scope]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .counters import VECTOR_SIZE, Scope
+
+# (guild_id, slot) for server leaderboards, (None, slot) for global ones
+BoardKey = Tuple[Optional[int], int]
+
+
+class RankIndex:
+    """Non-zero scores of one stats slot, kept sorted by score descending.
+
+    Rank lookups are a binary search; an update is a binary search plus a
+    list insert/delete, which stays cheap even for very large guilds.
+    """
+
+    def __init__(self) -> None:
+        self._scores: Dict[int, int] = {}
+        # (-score, user_id) so the natural ascending order puts top scores first
+        self._sorted: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def update(self, user_id: int, score: int) -> None:
+        if (old := self._scores.get(user_id)) is not None:
+            if old == score:
+                return
+            del self._sorted[bisect_left(self._sorted, (-old, user_id))]
+        if score <= 0:
+            self._scores.pop(user_id, None)
+            return
+        self._scores[user_id] = score
+        insort(self._sorted, (-score, user_id))
+
+    def top(self, n: int = 10) -> List[Tuple[int, int]]:
+        """Returns up to ``n`` ``(user_id, score)`` pairs, highest score first."""
+        return [(user_id, -neg) for neg, user_id in self._sorted[:n]]
+
+    def rank(self, user_id: int) -> Optional[Tuple[int, int]]:
+        """Returns the 1-based ``(rank, score)`` of a user or None if they haven't scored."""
+        if (score := self._scores.get(user_id)) is None:
+            return None
+        return bisect_left(self._sorted, (-score, user_id)) + 1, score
+
+
+class Leaderboards:
+    """Lazily built rank indexes for every stats slot, per guild and global.
+
+    A guild's (or the global) indexes are built from one full scan the first
+    time they are requested, then kept up to date by :meth:`on_increment`,
+    which the counter store calls for every increment.
+    """
+
+    def __init__(self) -> None:
+        self._boards: Dict[BoardKey, RankIndex] = {}
+        self._built: set = set()
+
+    def is_built(self, guild_id: Optional[int]) -> bool:
+        return guild_id in self._built
+
+    def get(self, guild_id: Optional[int], index: int) -> RankIndex:
+        return self._boards.setdefault((guild_id, index), RankIndex())
+
+    def build(self, guild_id: Optional[int], rows: Mapping[int, Sequence[int]]) -> None:
+        """(Re)build all slot indexes of a guild, or the global ones, from ``{user_id: stats}``."""
+        boards = [RankIndex() for _ in range(VECTOR_SIZE)]
+        for user_id, stats in rows.items():
+            for index, score in enumerate(stats):
+                if score:
+                    boards[index].update(user_id, score)
+        for index, board in enumerate(boards):
+            self._boards[(guild_id, index)] = board
+        self._built.add(guild_id)
+
+    def set_member(self, guild_id: int, user_id: int, stats: Sequence[int]) -> None:
+        """Replace a member's scores in every slot of a built guild, all zeros removes them."""
+        if guild_id not in self._built:
+            return
+        for index in range(VECTOR_SIZE):
+            self.get(guild_id, index).update(user_id, stats[index] if index < len(stats) else 0)
+
+    def forget_user(self, user_id: int) -> None:
+        for board in self._boards.values():
+            board.update(user_id, 0)
+
+    def forget(self, guild_id: Optional[int]) -> None:
+        for index in range(VECTOR_SIZE):
+            self._boards.pop((guild_id, index), None)
+        self._built.discard(guild_id)
+
+    def on_increment(self, scope: Scope, index: int, score: int) -> None:
+        guild_id = scope[0] if len(scope) == 2 else None
+        # boards that were never requested get their numbers from the full scan later
+        if guild_id in self._built:
+            self.get(guild_id, index).update(scope[-1], score)
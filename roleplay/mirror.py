@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import aiohttp
+
+logger = logging.getLogger("red.owo.roleplay")
+
+# stay under the smallest upload limit Discord has for bots
+MAX_FILE_SIZE = 8 * 1024 * 1024
+
+GIF_MODES = ("link", "mirror", "reuse")
+
+
+class GifMirror:
+    """Local copies of roleplay GIFs so they can be uploaded instead of hotlinked.
+
+    Files live in ``directory`` and the least recently used ones are deleted
+    once their total size goes over ``max_bytes``. File mtimes double as the
+    LRU clock, so the order survives reloads.
+
+    In ``reuse`` mode the CDN URL Discord gives the first upload of a GIF is
+    remembered and used for later embeds until that URL expires.
+    """
+
+    def __init__(self, directory: Path, *, max_bytes: int = 200 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.total_bytes = sum(f.stat().st_size for f in self.directory.iterdir() if f.is_file())
+        # source url -> (discord cdn url, expires at unix time)
+        self.uploads: Dict[str, Tuple[str, float]] = {}
+        # one per GIF url at most, the pools are finite so these don't need cleanup
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # writes run in executor threads, total_bytes and the files are only changed under this
+        self._disk_lock = threading.Lock()
+
+    def path_for(self, url: str) -> Path:
+        suffix = Path(urlparse(url).path).suffix or ".gif"
+        return self.directory / f"{hashlib.sha1(url.encode()).hexdigest()[:20]}{suffix}"
+
+    @staticmethod
+    def filename_for(url: str) -> str:
+        return f"roleplay{Path(urlparse(url).path).suffix or '.gif'}"
+
+    def _read(self, path: Path) -> Optional[bytes]:
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def _write(self, path: Path, data: bytes) -> None:
+        with self._disk_lock:
+            try:
+                self.total_bytes -= path.stat().st_size
+            except OSError:
+                pass
+            path.write_bytes(data)
+            self.total_bytes += len(data)
+            if self.total_bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * 0.9))
+
+    def evict(self, target_bytes: int) -> int:
+        """Delete least recently used files until at most ``target_bytes`` are used.
+
+        Blocks on disk I/O and on running writes, call it from an executor.
+        """
+        with self._disk_lock:
+            return self._evict(target_bytes)
+
+    def _evict(self, target_bytes: int) -> int:
+        files = sorted(
+            (f for f in self.directory.iterdir() if f.is_file()), key=lambda f: f.stat().st_mtime
+        )
+        removed = 0
+        for f in files:
+            if self.total_bytes <= target_bytes:
+                break
+            size = f.stat().st_size
+            try:
+                f.unlink()
+            except OSError:
+                continue
+            self.total_bytes -= size
+            removed += 1
+        return removed
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str) -> Optional[bytes]:
+        """GIF bytes from disk, downloading them first on a miss. None if that fails."""
+        loop = asyncio.get_running_loop()
+        path = self.path_for(url)
+        lock = self._locks.setdefault(url, asyncio.Lock())
+        async with lock:
+            if data := await loop.run_in_executor(None, self._read, path):
+                return data
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=20)) as resp:
+                    if resp.status != 200 or (resp.content_length or 0) > MAX_FILE_SIZE:
+                        return None
+                    data = await resp.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return None
+            if len(data) > MAX_FILE_SIZE:
+                return None
+            await loop.run_in_executor(None, self._write, path, data)
+            return data
+
+    def reusable_url(self, url: str) -> Optional[str]:
+        if (upload := self.uploads.get(url)) is None:
+            return None
+        cdn_url, expires_at = upload
+        # leave some headroom so the link doesn't die while someone is looking at it
+        if expires_at - time.time() < 3600:
+            del self.uploads[url]
+            return None
+        return cdn_url
+
+    def remember_upload(self, url: str, cdn_url: str) -> None:
+        # signed Discord CDN links carry their expiry as a hex timestamp in `ex`
+        expiry = parse_qs(urlparse(cdn_url).query).get("ex")
+        try:
+            expires_at = int(expiry[0], 16) if expiry else time.time() + 86400
+        except ValueError:
+            expires_at = time.time() + 86400
+        self.uploads[url] = (cdn_url, float(expires_at))
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+from .counters import ACTIONS, RECEIVED, SENT, SOLO_ACTIONS, Scope
+
+HEADER = ("Action", "Received", "Sent")
+
+
+def stats_table(stats: Sequence[int]) -> str:
+    """Render a stats vector as a psql style table in a single pass, zeros left blank."""
+    rows = []
+    for i, action in enumerate(ACTIONS):
+        if action in SOLO_ACTIONS:
+            continue
+        received, sent = stats[i * 2 + RECEIVED], stats[i * 2 + SENT]
+        rows.append(
+            (action.lower(), f"{received:,}" if received else "", f"{sent:,}" if sent else "")
+        )
+
+    widths = [max(len(HEADER[col]), *(len(row[col]) for row in rows)) for col in range(3)]
+    rule = "+".join("-" * (w + 2) for w in widths)
+    border = f"+{rule}+"
+
+    def line(row: Sequence[str]) -> str:
+        first, *numbers = row
+        cells = [f" {first:<{widths[0]}} "] + [
+            f" {value:>{width}} " for value, width in zip(numbers, widths[1:])
+        ]
+        return "|" + "|".join(cells) + "|"
+
+    lines = [border, line(HEADER), f"|{rule}|"]
+    lines.extend(line(row) for row in rows)
+    lines.append(border)
+    return "\n".join(lines)
+
+
+class StatsViewCache:
+    """Rendered stats tables per member/user, dropped whenever their counters change."""
+
+    def __init__(self, maxsize: int = 1000) -> None:
+        self.maxsize = maxsize
+        self._views: OrderedDict[Scope, str] = OrderedDict()
+
+    def get(self, scope: Scope) -> Optional[str]:
+        if (view := self._views.get(scope)) is not None:
+            self._views.move_to_end(scope)
+        return view
+
+    def render(self, scope: Scope, stats: Sequence[int]) -> str:
+        view = self._views[scope] = stats_table(stats)
+        self._views.move_to_end(scope)
+        if len(self._views) > self.maxsize:
+            self._views.popitem(last=False)
+        return view
+
+    def on_increment(self, scope: Scope, index: int, score: int) -> None:
+        self._views.pop(scope, None)
+
+    def forget_user(self, user_id: int) -> None:
+        for scope in [scope for scope in self._views if scope[-1] == user_id]:
+            del self._views[scope]
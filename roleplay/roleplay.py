@@ -1,22 +1,49 @@
+import asyncio
+import logging
+import tempfile
+from io import BytesIO
 from random import choice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import aiohttp
 import discord
+from discord.ext import tasks
 from redbot.core import Config, commands
 from redbot.core.bot import Red
 from redbot.core.commands import Context
-from redbot.core.utils.chat_formatting import box, bold, quote
+from redbot.core.data_manager import cog_data_path
+from redbot.core.utils.chat_formatting import box, bold, pagify, quote
 from redbot.core.utils.menus import menu, DEFAULT_CONTROLS
 
-from tabulate import tabulate
-
-from .constants import *
+from .actions import ROLEPLAY_ACTIONS, RoleplayAction
+from .counters import (
+    RECEIVED,
+    SENT,
+    SOLO_ACTIONS,
+    CounterStore,
+    Scope,
+    find_action,
+    from_legacy,
+    pack,
+    slot,
+    unpack,
+)
+from .export import EXPORT_FORMATS, PYARROW, READ_BATCH, Row, write_export
+from .gifcheck import UNREACHABLE, GifHealthIndex
+from .graph import InteractionGraph
+from .leaderboard import Leaderboards
+from .mirror import GIF_MODES, GifMirror
+from .render import StatsViewCache, stats_table
+
+log = logging.getLogger("red.owo.roleplay")
 
 
 class Roleplay(commands.Cog):
     """Do roleplay with your Discord friends or virtual strangers."""
 
     __authors__ = ["ow0x"]
-    __version__ = "1.2.0"
+    __version__ = "2.1.0"
 
     def format_help_for_context(self, ctx: commands.Context) -> str:
         """Thanks Sinbad."""
@@ -26,72 +53,118 @@ class Roleplay(commands.Cog):
             f"Cog version:  v{self.__version__}"
         )
 
-    async def red_delete_data_for_user(self, **kwargs):
-        """Nothing to delete"""
-        pass
+    async def red_delete_data_for_user(self, *, requester, user_id: int) -> None:
+        await self.counters.forget_user(user_id)
+        await self.interactions.forget_user(user_id)
+        self.leaderboards.forget_user(user_id)
+        self.stats_views.forget_user(user_id)
 
     def __init__(self, bot: Red):
         self.bot = bot
         self.config = Config.get_conf(self, 123456789987654321, force_registration=True)
         default_global = {"schema_version": 1}
-        self.possible_actions = [
-            "BAKAS",
-            "BULLY",
-            "CUDDLES",
-            "FEEDS",
-            "HIGHFIVES",
-            "HUGS",
-            "KILLS",
-            "KISSES",
-            "LICKS",
-            "NOMS",
-            "PATS",
-            "POKES",
-            "PUNCHES",
-            "SLAPS",
-            "TICKLES",
-        ]
-        default_user = {
-            "BAKAS_SENT": 0,
-            "BAKAS_RECEIVED": 0,
-            "BULLY_SENT": 0,
-            "BULLY_RECEIVED": 0,
-            "CUDDLES_SENT": 0,
-            "CUDDLES_RECEIVED": 0,
-            "CRY_COUNT": 0,
-            "FEEDS_SENT": 0,
-            "FEEDS_RECEIVED": 0,
-            "HIGHFIVES_SENT": 0,
-            "HIGHFIVES_RECEIVED": 0,
-            "HUGS_SENT": 0,
-            "HUGS_RECEIVED": 0,
-            "KILLS_SENT": 0,
-            "KILLS_RECEIVED": 0,
-            "KISSES_SENT": 0,
-            "KISSES_RECEIVED": 0,
-            "LICKS_SENT": 0,
-            "LICKS_RECEIVED": 0,
-            "NOMS_SENT": 0,
-            "NOMS_RECEIVED": 0,
-            "PATS_SENT": 0,
-            "PATS_RECEIVED": 0,
-            "POKES_SENT": 0,
-            "POKES_RECEIVED": 0,
-            "PUNCHES_SENT": 0,
-            "PUNCHES_RECEIVED": 0,
-            "SLAPS_SENT": 0,
-            "SLAPS_RECEIVED": 0,
-            "SMUG_COUNT": 0,
-            "TICKLES_SENT": 0,
-            "TICKLES_RECEIVED": 0,
-        }
-        self.config.register_global(**default_global)
-        self.config.register_member(**default_user)
+        # see counters.ACTIONS for the layout of the stats vector
+        default_user = {"stats": []}
+        self.config.register_global(**default_global, gif_mode="link", gif_mirror_mb=200)
+        self.config.register_member(**default_user, interactions={"sent": [], "received": []})
         self.config.register_user(**default_user)
+        self.counters = CounterStore(self.config)
+        self.leaderboards = Leaderboards()
+        self.counters.listeners.append(self.leaderboards.on_increment)
+        self.stats_views = StatsViewCache()
+        self.counters.listeners.append(self.stats_views.on_increment)
+        self.interactions = InteractionGraph(self.config)
+        self._flush_counters.start()
+        self._migration: Optional[asyncio.Task] = None
+        self.migration_failed = False
+        self.session = aiohttp.ClientSession()
+        self.gif_health = GifHealthIndex(cog_data_path(self) / "gif_health.json")
+        self.gif_health.load()
+        self._check_gifs.start()
+        self.gif_mode = "link"
+        self.gif_mirror = GifMirror(cog_data_path(self) / "gifs")
         # TODO: you can do better
         if self.bot.get_cog("General"):
             self.bot.remove_command("hug")
 
+    async def cog_load(self) -> None:
+        self.gif_mode = await self.config.gif_mode()
+        self.gif_mirror.max_bytes = await self.config.gif_mirror_mb() * 1024 * 1024
+        self._migration = asyncio.create_task(self._migrate_schema())
+
+    async def cog_check(self, ctx: Context) -> bool:
+        if self.migration_failed:
+            raise commands.UserFeedbackCheckFailure(
+                "Roleplay stats failed to migrate to the new storage format."
+                " The bot owner can check the logs and reload this cog to retry."
+            )
+        return True
+
+    async def _migrate_schema(self) -> None:
+        # v1 stored 32 separate named counters per member/user, v2 a single packed vector
+        try:
+            if await self.config.schema_version() < 2:
+                migrated = 0
+                all_members = await self.config.all_members()
+                for guild_id, members in all_members.items():
+                    for member_id, data in members.items():
+                        member_conf = self.config.member_from_ids(guild_id, member_id)
+                        await member_conf.set({"stats": self._migrated_stats(data)})
+                        migrated += 1
+                for user_id, data in (await self.config.all_users()).items():
+                    user_conf = self.config.user_from_id(user_id)
+                    await user_conf.set({"stats": self._migrated_stats(data)})
+                    migrated += 1
+                await self.config.schema_version.set(2)
+                log.info(f"Migrated roleplay stats of {migrated} members/users to schema v2.")
+        except Exception:
+            # counters stay gated, reading or writing half migrated stats would corrupt them
+            self.migration_failed = True
+            log.exception("Roleplay stats migration failed, it will be retried on next load.")
+            return
+        self.counters.ready.set()
+
+    @staticmethod
+    def _migrated_stats(data: Dict[str, Any]) -> List[int]:
+        # merge, in case an earlier interrupted migration already wrote a vector for this entry
+        stats = unpack(data.get("stats") or [])
+        return pack([a + b for a, b in zip(stats, from_legacy(data))])
+
+    async def cog_unload(self) -> None:
+        if self._migration:
+            self._migration.cancel()
+        self._flush_counters.cancel()
+        self._check_gifs.cancel()
+        # buffered increments would be lost with the cog, write them out before it goes
+        await self._flush()
+        await self.session.close()
+
+    async def _flush(self) -> None:
+        await self.counters.flush()
+        await self.interactions.flush()
+
+    @tasks.loop(seconds=30)
+    async def _flush_counters(self) -> None:
+        # shielded, so cancelling the loop on unload can't cut a flush off halfway
+        await asyncio.shield(self._flush())
+
+    async def _count_action(
+        self, ctx: Context, member: discord.Member, action: str
+    ) -> Tuple[int, int]:
+        """Bump the SENT/RECEIVED counters of an action, returns new (sent, received) counts."""
+        sent, received, _, _ = await self.counters.increment(
+            *self.counters.action_updates(ctx.guild.id, ctx.author.id, member.id, action)
+        )
+        await self.interactions.record(ctx.guild.id, ctx.author.id, member.id, action)
+        return sent, received
+
+    async def _count_solo(self, ctx: Context, action: str) -> int:
+        count, _ = await self.counters.increment(
+            (self.counters.member(ctx.guild.id, ctx.author.id), slot(action)),
+            (self.counters.user(ctx.author.id), slot(action)),
+        )
+        return count
+
     @staticmethod
     async def temp_tip(ctx: commands.Context):
         pre = ctx.clean_prefix
@@ -100,532 +173,238 @@ class Roleplay(commands.Cog):
             delete_after=10.0,
         )
 
+    async def _perform(
+        self, ctx: Context, action: RoleplayAction, member: Optional[discord.Member] = None
+    ) -> discord.Message:
+        """Run a roleplay action from the action table against ``member``, returns the reply."""
+        fields = {
+            "author": ctx.author.name,
+            "author_bold": bold(ctx.author.name),
+            "author_mention": ctx.author.mention,
+            "extra": choice(action.strings) if action.strings else "",
+        }
+        message, gif = action.message, self.pick_gif(action)
+        if member is not None:
+            is_bot, is_self = member.id == ctx.me.id, member.id == ctx.author.id
+            fields.update(
+                member=member.mention,
+                member_name=member.name,
+                them="I" if is_bot else member.name,
+            )
+            if is_bot and action.bot_reply:
+                if not action.bot_reply_gif:
+                    return await ctx.send(action.bot_reply.format(**fields))
+                em = discord.Embed(colour=await ctx.embed_colour())
+                em.set_image(url=action.bot_reply_gif)
+                return await ctx.send(content=action.bot_reply.format(**fields), embed=em)
+            if is_self and action.self_reply:
+                return await ctx.send(action.self_reply.format(**fields))
+            if is_bot and action.bot_message:
+                message, gif = action.bot_message, action.bot_gif or gif
+            elif is_self and action.self_message:
+                message = action.self_message
+
+        async with ctx.typing():
+            if action.solo:
+                fields["count"] = await self._count_solo(ctx, action.action)
+            else:
+                fields["sent"], fields["received"] = await self._count_action(
+                    ctx, member, action.action
+                )
+            embed = discord.Embed(colour=(member or ctx.author).colour)
+            file = await self._attach_gif(ctx, embed, gif)
+            embed.set_footer(text=action.footer.format(**fields))
+            content = None
+            if action.in_description:
+                embed.description = message.format(**fields)
+            else:
+                content = quote(message.format(**fields))
+            msg = await ctx.send(content=content, embed=embed, file=file)
+            if file and self.gif_mode == "reuse" and msg.attachments:
+                self.gif_mirror.remember_upload(gif, msg.attachments[0].url)
+            return msg
+
+    async def _attach_gif(
+        self, ctx: Context, embed: discord.Embed, gif: str
+    ) -> Optional[discord.File]:
+        """Set the embed image, uploading a local copy of the GIF when mirroring is on."""
+        if self.gif_mode == "reuse" and (cdn_url := self.gif_mirror.reusable_url(gif)):
+            embed.set_image(url=cdn_url)
+            return None
+        can_upload = ctx.channel.permissions_for(ctx.me).attach_files
+        if self.gif_mode == "link" or not can_upload:
+            embed.set_image(url=gif)
+            return None
+        if not (data := await self.gif_mirror.fetch(self.session, gif)):
+            embed.set_image(url=gif)
+            return None
+        filename = self.gif_mirror.filename_for(gif)
+        embed.set_image(url=f"attachment://{filename}")
+        return discord.File(BytesIO(data), filename=filename)
+
+    def pick_gif(self, action: RoleplayAction) -> str:
+        return self.gif_health.pick(action.gifs)
+
+    @staticmethod
+    def all_gif_urls() -> Dict[str, List[str]]:
+        urls: Dict[str, List[str]] = {}
+        for name, action in ROLEPLAY_ACTIONS.items():
+            extra = [gif for gif in (action.bot_gif, action.bot_reply_gif) if gif]
+            urls[name] = list(action.gifs) + extra
+        return urls
+
+    @tasks.loop(hours=24)
+    async def _check_gifs(self) -> None:
+        urls = [url for pool in self.all_gif_urls().values() for url in pool]
+        checked = await self.gif_health.check(self.session, urls)
+        if checked:
+            dead = len(self.gif_health.dead())
+            log.info(f"Checked {checked} roleplay GIF URLs, {dead} of them are dead.")
+
+    @_check_gifs.before_loop
+    async def _before_check_gifs(self) -> None:
+        await self.bot.wait_until_ready()
+
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["baka"].cooldown, commands.BucketType.member)
     async def baka(self, ctx: Context, *, member: discord.Member):
         """Call someone a BAKA with a GIF reaction!"""
-        if member.id == ctx.me.id:
-            return await ctx.send("**Ｎ Ｏ   Ｕ**")
-        if member.id == ctx.author.id:
-            return await ctx.send(f"{bold(ctx.author.name)}, you really are BAKA. Stupid!! 💩")
-
-        async with ctx.typing():
-            baka_to = await self.config.member(ctx.author).BAKAS_SENT()
-            baka_from = await self.config.member(member).BAKAS_RECEIVED()
-            gbaka_to = await self.config.user(ctx.author).BAKAS_SENT()
-            gbaka_from = await self.config.user(member).BAKAS_RECEIVED()
-            await self.config.member(ctx.author).BAKAS_SENT.set(baka_to + 1)
-            await self.config.member(member).BAKAS_RECEIVED.set(baka_from + 1)
-            await self.config.user(ctx.author).BAKAS_SENT.set(gbaka_to + 1)
-            await self.config.user(member).BAKAS_RECEIVED.set(gbaka_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            message = f"_**{ctx.author.name}** calls {member.mention} a BAKA bahahahahaha!!!_"
-            embed.set_image(url=choice(BAKA))
-            footer = (
-                f"{ctx.author.name} used baka: {baka_to + 1} times so far.\n"
-                f"{member.name} got called a BAKA: {baka_from + 1} times  so far."
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["baka"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 60, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["bully"].cooldown, commands.BucketType.member)
     async def bully(self, ctx: Context, *, member: discord.Member):
         """Bully someone in this server with a funny GIF!"""
-        if member.id == ctx.me.id:
-            return await ctx.send("**Ｎ Ｏ   Ｕ**")
-        if member.id == ctx.author.id:
-            return await ctx.send(
-                f"{ctx.author.mention} Self bullying doesn't make sense. Stop it, get some help."
-            )
-        async with ctx.typing():
-            bully_to = await self.config.member(ctx.author).BULLY_SENT()
-            bully_from = await self.config.member(member).BULLY_RECEIVED()
-            gbully_to = await self.config.user(ctx.author).BULLY_SENT()
-            gbully_from = await self.config.user(member).BULLY_RECEIVED()
-            await self.config.member(ctx.author).BULLY_SENT.set(bully_to + 1)
-            await self.config.member(member).BULLY_RECEIVED.set(bully_from + 1)
-            await self.config.user(ctx.author).BULLY_SENT.set(gbully_to + 1)
-            await self.config.user(member).BULLY_RECEIVED.set(gbully_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            message = f"_**{ctx.author.name}** bullies {member.mention}_ 🤡"
-            embed.set_image(url=choice(BULLY))
-            footer = (
-                f"{ctx.author.name} bullied: {bully_to + 1} times so far.\n"
-                f"{member.name} got bullied: {bully_from + 1} times so far.\n"
-                f"Someone call police to get {ctx.author.name} arrested."
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["bully"], member)
 
     @commands.command()
+    @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["cry"].cooldown, commands.BucketType.member)
     async def cry(self, ctx: Context):
         """Let others know that you feel like crying or just wanna cry."""
-        async with ctx.typing():
-            cry_count = await self.config.member(ctx.author).CRY_COUNT()
-            gcry_count = await self.config.user(ctx.author).CRY_COUNT()
-            await self.config.member(ctx.author).CRY_COUNT.set(cry_count + 1)
-            await self.config.user(ctx.author).CRY_COUNT.set(gcry_count + 1)
-            embed = discord.Embed(colour=ctx.author.colour)
-            embed.description = f"{ctx.author.mention} {choice(CRY_STRINGS)}"
-            embed.set_image(url=choice(CRY))
-            footer = f"{ctx.author.name} has cried {cry_count + 1} times in this server so far."
-            embed.set_footer(text=footer)
-            return await ctx.send(embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["cry"])
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["cuddle"].cooldown, commands.BucketType.member)
     async def cuddle(self, ctx: Context, *, member: discord.Member):
         """Cuddle with a server member!"""
-        if member.id == ctx.author.id:
-            return await ctx.send(
-                f"{ctx.author.mention} According to all known laws of roleplay, "
-                "there is no way you can cuddle yourself! Go cuddle with "
-                "someone... or a pillow, if you're lonely like me. 😔"
-            )
-
-        async with ctx.typing():
-            cuddle_to = await self.config.member(ctx.author).CUDDLES_SENT()
-            cuddle_from = await self.config.member(member).CUDDLES_RECEIVED()
-            gcuddle_to = await self.config.user(ctx.author).CUDDLES_SENT()
-            gcuddle_from = await self.config.user(member).CUDDLES_RECEIVED()
-            await self.config.member(ctx.author).CUDDLES_SENT.set(cuddle_to + 1)
-            await self.config.member(member).CUDDLES_RECEIVED.set(cuddle_from + 1)
-            await self.config.user(ctx.author).CUDDLES_SENT.set(gcuddle_to + 1)
-            await self.config.user(member).CUDDLES_RECEIVED.set(gcuddle_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            if member.id == ctx.me.id:
-                message = f"Awww thanks for cuddles, {bold(ctx.author.name)}! Very kind of you. 😳"
-            else:
-                message = f"_**{ctx.author.name}** cuddles_ {member.mention}"
-            embed.set_image(url=str(choice(CUDDLE)))
-            footer = (
-                f"{ctx.author.name} sent: {cuddle_to + 1} cuddles so far.\n"
-                f"{'I' if member.id == ctx.me.id else member.name} "
-                f"received: {cuddle_from + 1} cuddles so far."
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["cuddle"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["feed"].cooldown, commands.BucketType.member)
     async def feed(self, ctx: Context, *, member: discord.Member):
         """Feed someone from this server virtually!"""
-        if member.id == ctx.author.id:
-            return await ctx.send(f"_{ctx.author.mention} eats {bold(choice(RECIPES))}!_")
-
-        async with ctx.typing():
-            feed_to = await self.config.member(ctx.author).FEEDS_SENT()
-            feed_from = await self.config.member(member).FEEDS_RECEIVED()
-            gfeed_to = await self.config.user(ctx.author).FEEDS_SENT()
-            gfeed_from = await self.config.user(member).FEEDS_RECEIVED()
-            await self.config.member(ctx.author).FEEDS_SENT.set(feed_to + 1)
-            await self.config.member(member).FEEDS_RECEIVED.set(feed_from + 1)
-            await self.config.user(ctx.author).FEEDS_SENT.set(gfeed_to + 1)
-            await self.config.user(member).FEEDS_RECEIVED.set(gfeed_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            if member.id == ctx.me.id:
-                message = f"OWO! Thanks for yummy food..., {bold(ctx.author.name)}! ❤️"
-            else:
-                message = f"_**{ctx.author.name}** feeds {member.mention} some delicious food!_"
-            embed.set_image(url=choice(FEED))
-            footer = (
-                f"{ctx.author.name} have fed others: {feed_to + 1} times so far.\n"
-                f"{'I' if member.id == ctx.me.id else member.name} "
-                f"received some food: {feed_from + 1} times so far."
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["feed"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["highfive"].cooldown, commands.BucketType.member)
     async def highfive(self, ctx: Context, *, member: discord.Member):
         """High-fives a user!"""
-        if member.id == ctx.author.id:
-            return await ctx.send(
-                f"_{ctx.author.mention} high-fives themselves in mirror, I guess?_"
-            )
-
-        async with ctx.typing():
-            h5_to = await self.config.member(ctx.author).HIGHFIVES_SENT()
-            h5_from = await self.config.member(member).HIGHFIVES_RECEIVED()
-            gh5_to = await self.config.user(ctx.author).HIGHFIVES_SENT()
-            gh5_from = await self.config.user(member).HIGHFIVES_RECEIVED()
-            await self.config.member(ctx.author).HIGHFIVES_SENT.set(h5_to + 1)
-            await self.config.member(member).HIGHFIVES_RECEIVED.set(h5_from + 1)
-            await self.config.user(ctx.author).HIGHFIVES_SENT.set(gh5_to + 1)
-            await self.config.user(member).HIGHFIVES_RECEIVED.set(gh5_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            if member.id == ctx.me.id:
-                message = f"_high-fives back to {bold(ctx.author.name)}_ 👀"
-                embed.set_image(url="https://i.imgur.com/hQPCYUJ.gif")
-            else:
-                message = f"_**{ctx.author.name}** high fives_ {member.mention}"
-                embed.set_image(url=choice(HIGHFIVE))
-            footer = (
-                f"{ctx.author.name} sent: {h5_to + 1} high-fives so far.\n"
-                f"{'I' if member.id == ctx.me.id else member.name} "
-                f"received: {h5_from + 1} high-fives so far."
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["highfive"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["hug"].cooldown, commands.BucketType.member)
     async def hug(self, ctx: Context, *, member: discord.Member):
         """Hug a user virtually on Discord!"""
-        if member.id == ctx.author.id:
-            return await ctx.send(
-                f"{ctx.author.mention} One dOEs NOt SiMplY hUg THeIR oWn sELF!!!!!"
-            )
-
-        async with ctx.typing():
-            hug_to = await self.config.member(ctx.author).HUGS_SENT()
-            hug_from = await self.config.member(member).HUGS_RECEIVED()
-            ghug_to = await self.config.user(ctx.author).HUGS_SENT()
-            ghug_from = await self.config.user(member).HUGS_RECEIVED()
-            await self.config.member(ctx.author).HUGS_SENT.set(hug_to + 1)
-            await self.config.member(member).HUGS_RECEIVED.set(hug_from + 1)
-            await self.config.user(ctx.author).HUGS_SENT.set(ghug_to + 1)
-            await self.config.user(member).HUGS_RECEIVED.set(ghug_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            if member.id == ctx.me.id:
-                message = f"Awwww thanks! So nice of you! _hugs **{ctx.author.name}** back_ 🤗"
-            else:
-                message = f"_**{ctx.author.name}** hugs_ {member.mention} 🤗"
-            embed.set_image(url=str(choice(HUG)))
-            footer = (
-                f"{ctx.author.name} gave: {hug_to + 1} hugs so far.\n"
-                f"{'I' if member.id == ctx.me.id else member.name} "
-                f"received: {hug_from + 1} hugs so far!"
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["hug"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 60, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["kill"].cooldown, commands.BucketType.member)
     async def kill(self, ctx: Context, *, member: discord.Member):
         """Virtually attempt to kill a server member with a GIF reaction!"""
-        if member.id == ctx.me.id:
-            return await ctx.send("**Ｎ Ｏ   Ｕ**")
-        if member.id == ctx.author.id:
-            return await ctx.send(f"{ctx.author.mention} Seppukku is not allowed on my watch. 💀")
-
-        async with ctx.typing():
-            kill_to = await self.config.member(ctx.author).KILLS_SENT()
-            kill_from = await self.config.member(member).KILLS_RECEIVED()
-            gkill_to = await self.config.user(ctx.author).KILLS_SENT()
-            gkill_from = await self.config.user(member).KILLS_RECEIVED()
-            await self.config.member(ctx.author).KILLS_SENT.set(kill_to + 1)
-            await self.config.member(member).KILLS_RECEIVED.set(kill_from + 1)
-            await self.config.user(ctx.author).KILLS_SENT.set(gkill_to + 1)
-            await self.config.user(member).KILLS_RECEIVED.set(gkill_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            message = f"_**{ctx.author.name}** tries to kill {member.mention}!_ 🇫"
-            embed.set_image(url=choice(KILL))
-            footer = (
-                f"{ctx.author.name} attempted: {kill_to + 1} kills so far.\n"
-                f"{member.name} got killed: {kill_from + 1} times so far!"
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["kill"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["kiss"].cooldown, commands.BucketType.member)
     async def kiss(self, ctx: Context, *, member: discord.Member):
         """[NSFW] Kiss a user! Only allowed in NSFW channel."""
-        if member.id == ctx.author.id:
-            return await ctx.send(
-                f"Poggers {bold(ctx.author.name)}, you just kissed yourself! LOL!!! 💋"
-            )
-        async with ctx.typing():
-            kiss_to = await self.config.member(ctx.author).KISSES_SENT()
-            kiss_from = await self.config.member(member).KISSES_RECEIVED()
-            gkiss_to = await self.config.user(ctx.author).KISSES_SENT()
-            gkiss_from = await self.config.user(member).KISSES_RECEIVED()
-            await self.config.member(ctx.author).KISSES_SENT.set(kiss_to + 1)
-            await self.config.member(member).KISSES_RECEIVED.set(kiss_from + 1)
-            await self.config.user(ctx.author).KISSES_SENT.set(gkiss_to + 1)
-            await self.config.user(member).KISSES_RECEIVED.set(gkiss_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            if member.id == ctx.me.id:
-                message = f"Awwww so nice of you! _kisses **{ctx.author.name}** back!_ 😘 🥰"
-            else:
-                message = f"_**{ctx.author.name}** kisses_ {member.mention} 😘 🥰"
-            embed.set_image(url=str(choice(KISS)))
-            footer = (
-                f"{ctx.author.name} sent: {kiss_to + 1} kisses so far.\n"
-                f"{member.name} received: {kiss_from + 1} kisses so far!"
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["kiss"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["lick"].cooldown, commands.BucketType.member)
     async def lick(self, ctx: Context, *, member: discord.Member):
         """[NSFW] Lick a user! Only allowed in NSFW channel."""
-        if member.id == ctx.me.id:
-            return await ctx.send(
-                f"{ctx.author.mention} You wanna lick a bot? Very horny! Here, lick this: 🍆"
-            )
-        async with ctx.typing():
-            lick_to = await self.config.member(ctx.author).LICKS_SENT()
-            lick_from = await self.config.member(member).LICKS_RECEIVED()
-            glick_to = await self.config.user(ctx.author).LICKS_SENT()
-            glick_from = await self.config.user(member).LICKS_RECEIVED()
-            await self.config.member(ctx.author).LICKS_SENT.set(lick_to + 1)
-            await self.config.member(member).LICKS_RECEIVED.set(lick_from + 1)
-            await self.config.user(ctx.author).LICKS_SENT.set(glick_to + 1)
-            await self.config.user(member).LICKS_RECEIVED.set(glick_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            message = (
-                f"{ctx.author.mention} Poggers, you just licked yourself. 👏"
-                if member.id == ctx.author.id
-                else f"_**{ctx.author.name}** licks_ {member.mention} 😳"
-            )
-            embed.set_image(url=choice(LICK))
-            footer = (
-                f"{ctx.author.name} have licked others: {lick_to + 1} times so far.\n"
-                f"{member.name} got licked: {lick_from + 1} times so far!"
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["lick"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["nom"].cooldown, commands.BucketType.member)
     async def nom(self, ctx: Context, *, member: discord.Member):
         """Try to nom/bite a server member!"""
-        if member.id == ctx.me.id:
-            return await ctx.send("**OH NO!** _runs away_")
-        message = (
-            f"Waaaaaa! {bold(ctx.author.name)}, You bit yourself! Whyyyy?? 😭"
-            if member.id == ctx.author.id
-            else f"_**{ctx.author.name}** casually noms_ {member.mention} 😈"
-        )
-        async with ctx.typing():
-            nom_to = await self.config.member(ctx.author).NOMS_SENT()
-            nom_from = await self.config.member(member).NOMS_RECEIVED()
-            gnom_to = await self.config.user(ctx.author).NOMS_SENT()
-            gnom_from = await self.config.user(member).NOMS_RECEIVED()
-            await self.config.member(ctx.author).NOMS_SENT.set(nom_to + 1)
-            await self.config.member(member).NOMS_RECEIVED.set(nom_from + 1)
-            await self.config.user(ctx.author).NOMS_SENT.set(gnom_to + 1)
-            await self.config.user(member).NOMS_RECEIVED.set(gnom_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            embed.set_image(url=choice(BITE))
-            footer = (
-                f"{ctx.author.name} nom'd: {nom_to + 1} times so far.\n"
-                f"{member.name} received: {nom_from + 1} noms so far!"
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["nom"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["pat"].cooldown, commands.BucketType.member)
     async def pat(self, ctx: Context, *, member: discord.Member):
         """Pat a server member with wholesome GIF!"""
-        if member.id == ctx.author.id:
-            return await ctx.send(f"{ctx.author.mention} _pats themselves, I guess? **yay**_ 🎉")
-        async with ctx.typing():
-            pat_to = await self.config.member(ctx.author).PATS_SENT()
-            pat_from = await self.config.member(member).PATS_RECEIVED()
-            gpat_to = await self.config.user(ctx.author).PATS_SENT()
-            gpat_from = await self.config.user(member).PATS_RECEIVED()
-            await self.config.member(ctx.author).PATS_SENT.set(pat_to + 1)
-            await self.config.member(member).PATS_RECEIVED.set(pat_from + 1)
-            await self.config.user(ctx.author).PATS_SENT.set(gpat_to + 1)
-            await self.config.user(member).PATS_RECEIVED.set(gpat_from + 1)
-            message = (
-                f"Wowie! Thanks {bold(ctx.author.name)} for giving me pats. 😳 😘"
-                if member.id == ctx.me.id
-                else f"_**{ctx.author.name}** pats_ {member.mention}"
-            )
-            embed = discord.Embed(colour=member.colour)
-            embed.set_image(url=choice(PAT))
-            footer = (
-                f"{ctx.author.name} gave: {pat_to + 1} pats so far.\n"
-                f"{'I' if member.id == ctx.me.id else member.name} "
-                f"received: {pat_from + 1} pats so far!"
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["pat"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["poke"].cooldown, commands.BucketType.member)
     async def poke(self, ctx: Context, *, member: discord.Member):
         """Poke your Discord friends or strangers!"""
-        if member.id == ctx.author.id:
-            return await ctx.send(f"{bold(ctx.author.name)} wants to play self poke huh?!")
-        async with ctx.typing():
-            poke_to = await self.config.member(ctx.author).POKES_SENT()
-            poke_from = await self.config.member(member).POKES_RECEIVED()
-            gpoke_to = await self.config.user(ctx.author).POKES_SENT()
-            gpoke_from = await self.config.user(member).POKES_RECEIVED()
-            await self.config.member(ctx.author).POKES_SENT.set(poke_to + 1)
-            await self.config.member(member).POKES_RECEIVED.set(poke_from + 1)
-            await self.config.user(ctx.author).POKES_SENT.set(gpoke_to + 1)
-            await self.config.user(member).POKES_RECEIVED.set(gpoke_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            embed = discord.Embed(colour=member.colour)
-            if member.id == ctx.me.id:
-                message = f"Awwww! Hey there. _pokes **{ctx.author.name}** back!_"
-            else:
-                message = f"_**{ctx.author.name}** casually pokes_ {member.mention}"
-            embed.set_image(url=choice(POKE))
-            footer = (
-                f"{ctx.author.name} gave: {poke_to + 1} pokes so far.\n"
-                f"{'I' if member.id == ctx.me.id else member.name} "
-                f"received: {poke_from + 1} pokes so far!"
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["poke"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 60, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["punch"].cooldown, commands.BucketType.member)
     async def punch(self, ctx: Context, *, member: discord.Member):
         """Punch someone on Discord with a GIF reaction!"""
-        if member.id == ctx.me.id:
-            message = (
-                f"{ctx.author.mention} tried to punch a bot but failed miserably,\n"
-                "and they actually punched themselves instead.\n"
-                "How disappointing LMFAO! 😂 😂 😂"
-            )
-            em = discord.Embed(colour=await ctx.embed_colour())
-            em.set_image(url="https://i.imgur.com/iVgOijZ.gif")
-            return await ctx.send(content=message, embed=em)
-        if member.id == ctx.author.id:
-            return await ctx.send(
-                f"I uh ..... **{ctx.author.name}**, self harm does"
-                " not sound so fun. Stop it, get some help."
-            )
-        async with ctx.typing():
-            punch_to = await self.config.member(ctx.author).PUNCHES_SENT()
-            punch_from = await self.config.member(member).PUNCHES_RECEIVED()
-            gpunch_to = await self.config.user(ctx.author).PUNCHES_SENT()
-            gpunch_from = await self.config.user(member).PUNCHES_RECEIVED()
-            await self.config.member(ctx.author).PUNCHES_SENT.set(punch_to + 1)
-            await self.config.member(member).PUNCHES_RECEIVED.set(punch_from + 1)
-            await self.config.user(ctx.author).PUNCHES_SENT.set(gpunch_to + 1)
-            await self.config.user(member).PUNCHES_RECEIVED.set(gpunch_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            message = f"_**{ctx.author.name}** {choice(PUNCH_STRINGS)}_ {member.mention}"
-            embed.set_image(url=choice(PUNCH))
-            footer = (
-                f"{ctx.author.name} sent: {punch_to + 1} punches so far.\n"
-                f"{member.name} received: {punch_from + 1} punches so far!"
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["punch"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 60, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["slap"].cooldown, commands.BucketType.member)
     async def slap(self, ctx: Context, *, member: discord.Member):
         """Slap a server member!"""
-        if member.id == ctx.me.id:
-            return await ctx.send("**Ｎ Ｏ   Ｕ**")
-        if member.id == ctx.author.id:
-            return await ctx.send(f"{ctx.author.mention} Don't slap yourself, you're precious!")
-        async with ctx.typing():
-            slap_to = await self.config.member(ctx.author).SLAPS_SENT()
-            slap_from = await self.config.member(member).SLAPS_RECEIVED()
-            gslap_to = await self.config.user(ctx.author).SLAPS_SENT()
-            gslap_from = await self.config.user(member).SLAPS_RECEIVED()
-            await self.config.member(ctx.author).SLAPS_SENT.set(slap_to + 1)
-            await self.config.member(member).SLAPS_RECEIVED.set(slap_from + 1)
-            await self.config.user(ctx.author).SLAPS_SENT.set(gslap_to + 1)
-            await self.config.user(member).SLAPS_RECEIVED.set(gslap_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            message = f"_**{ctx.author.name}** slaps_ {member.mention}"
-            embed.set_image(url=choice(SLAP))
-            footer = (
-                f"{ctx.author.name} gave: {slap_to + 1} slaps so far.\n"
-                f"{member.name} received: {slap_from + 1} slaps so far!"
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["slap"], member)
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["smug"].cooldown, commands.BucketType.member)
     async def smug(self, ctx: Context):
         """Show everyone your smug face!"""
-        message = f"_**{ctx.author.name}** smugs at **@\u200bsomeone**_ 😏"
-        async with ctx.typing():
-            smug_count = await self.config.member(ctx.author).SMUG_COUNT()
-            gsmug_count = await self.config.user(ctx.author).SMUG_COUNT()
-            await self.config.member(ctx.author).SMUG_COUNT.set(smug_count + 1)
-            await self.config.user(ctx.author).SMUG_COUNT.set(gsmug_count + 1)
-            embed = discord.Embed(colour=ctx.author.colour)
-            embed.set_image(url=choice(SMUG))
-            footer = f"{ctx.author.name} has smugged {smug_count + 1} times in this server so far."
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["smug"])
 
     @commands.command()
     @commands.guild_only()
     @commands.bot_has_permissions(embed_links=True)
-    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.cooldown(1, ROLEPLAY_ACTIONS["tickle"].cooldown, commands.BucketType.member)
     async def tickle(self, ctx: Context, *, member: discord.Member):
         """Try to tickle a server member!"""
-        if member.id == ctx.author.id:
-            return await ctx.send(
-                f"{ctx.author.mention} tickling yourself is boring!"
-                " Tickling others is more fun though, right? 😏"
-            )
-        async with ctx.typing():
-            tickle_to = await self.config.member(ctx.author).TICKLES_SENT()
-            tickle_from = await self.config.member(member).TICKLES_RECEIVED()
-            gtickle_to = await self.config.user(ctx.author).TICKLES_SENT()
-            gtickle_from = await self.config.user(member).TICKLES_RECEIVED()
-            await self.config.member(ctx.author).TICKLES_SENT.set(tickle_to + 1)
-            await self.config.member(member).TICKLES_RECEIVED.set(tickle_from + 1)
-            await self.config.user(ctx.author).TICKLES_SENT.set(gtickle_to + 1)
-            await self.config.user(member).TICKLES_RECEIVED.set(gtickle_from + 1)
-            embed = discord.Embed(colour=member.colour)
-            if member.id == ctx.me.id:
-                message = f"_Wow, nice tickling skills, {bold(ctx.author.name)}. I LOL'd._ 🤣 🤡"
-                embed.set_image(url="https://i.imgur.com/6jr50Fp.gif")
-            else:
-                message = f"_**{ctx.author.name}** tickles_ {member.mention}"
-                embed.set_image(url=choice(TICKLE))
-            footer = (
-                f"{ctx.author.name} tickled others: {tickle_to + 1} times so far.\n"
-                f"{'I' if member.id == ctx.me.id else member.name} "
-                f"received: {tickle_from + 1} tickles so far!"
-            )
-            embed.set_footer(text=footer)
-            return await ctx.send(content=quote(message), embed=embed)
+        await self._perform(ctx, ROLEPLAY_ACTIONS["tickle"], member)
+
+    async def _stats_view(self, scope: Scope) -> str:
+        if (view := self.stats_views.get(scope)) is not None:
+            return view
+        return self.stats_views.render(scope, await self.counters.get(scope))
 
     @commands.guild_only()
     @commands.command(name="rpstats")
@@ -634,32 +413,16 @@ class Roleplay(commands.Cog):
     async def roleplay_stats(self, ctx: Context, *, member: discord.Member = None):
         """Get your roleplay stats for this server."""
         user = member or ctx.author
+        def get_avatar(user):
+            if discord.version_info.major >= 2:
+                return user.display_avatar.url
+            return str(user.avatar_url)
+
         async with ctx.typing():
-            actions_data = await self.config.member(user).all()
-            global_actions_data = await self.config.user(user).all()
-            colalign, header = (("left", "right", "right"), ["Action", "Received", "Sent"])
-            people_with_no_creativity = []
-            global_actions_array = []
-            def parse_actions(data, array, action: str):
-                for key, value in data.items():
-                    if action in key:
-                        sent = str(data.get(f"{action}_SENT", " ")).replace("0", " ")
-                        received = str(data.get(f"{action}_RECEIVED", " ")).replace("0", " ")
-                        array.append([action.lower(), received, sent])
-
-            for act in self.possible_actions:
-                parse_actions(actions_data, people_with_no_creativity, act)
-
-            def get_avatar(user):
-                if discord.version_info.major >= 2:
-                    return user.display_avatar.url
-                return str(user.avatar_url)
+            server_table = await self._stats_view(self.counters.member(ctx.guild.id, user.id))
+            global_table = await self._stats_view(self.counters.user(user.id))
 
             pages = []
-            dedupe_list_1 = [x for i, x in enumerate(people_with_no_creativity, 1) if i % 2 != 0]
-            server_table = tabulate(
-                dedupe_list_1, headers=header, colalign=colalign, tablefmt="psql"
-            )
             emb = discord.Embed(
                 colour=await ctx.embed_colour(), description=box(server_table, "nim")
             )
@@ -667,13 +430,6 @@ class Roleplay(commands.Cog):
             emb.set_footer(text="Go to next page to see your global roleplay stats!")
             pages.append(emb)
 
-            for action in self.possible_actions:
-                parse_actions(global_actions_data, global_actions_array, action)
-
-            dedupe_list_2 = [x for i, x in enumerate(global_actions_array, 1) if i % 2 != 0]
-            global_table = tabulate(
-                dedupe_list_2, headers=header, colalign=colalign, tablefmt="psql"
-            )
             embed = discord.Embed(
                 colour=await ctx.embed_colour(), description=box(global_table, "nim")
             )
@@ -682,3 +438,265 @@ class Roleplay(commands.Cog):
             pages.append(embed)
 
         await menu(ctx, pages, DEFAULT_CONTROLS, timeout=60.0)
+
+    async def _ensure_leaderboards(self, guild: Optional[discord.Guild]) -> None:
+        guild_id = guild.id if guild else None
+        if self.leaderboards.is_built(guild_id):
+            return
+        await self.counters.ready.wait()
+        stored = await (self.config.all_members(guild) if guild else self.config.all_users())
+        rows = {int(k): unpack(v.get("stats") or []) for k, v in stored.items()}
+        # cached vectors include increments that haven't been flushed to Config yet
+        rows.update(self.counters.cached(guild_id))
+        if guild:
+            # members who left keep their stats, but they don't take part in the ranking
+            rows = {k: v for k, v in rows.items() if guild.get_member(k)}
+        self.leaderboards.build(guild_id, rows)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        self.leaderboards.set_member(member.guild.id, member.id, [])
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        if self.leaderboards.is_built(member.guild.id) and self.counters.ready.is_set():
+            stats = await self.counters.get(self.counters.member(member.guild.id, member.id))
+            self.leaderboards.set_member(member.guild.id, member.id, stats)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.leaderboards.forget(guild.id)
+
+    @commands.guild_only()
+    @commands.command(name="rpleaderboard", aliases=["rplb", "rptop"])
+    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.bot_has_permissions(embed_links=True)
+    async def roleplay_leaderboard(self, ctx: Context, action: str, *options: str):
+        """See who used a roleplay action the most in this server.
+
+        Add `received` to rank members by how often they were on the receiving end,
+        and `global` to see the leaderboard across all servers.
+
+        **Example:**
+            - `[p]rplb hug` - the biggest huggers in this server
+            - `[p]rplb slap received` - the most slapped members in this server
+            - `[p]rplb pat global` - the biggest patters across all servers
+        """
+        options = {option.lower() for option in options}
+        if not options <= {"received", "global"}:
+            return await ctx.send_help()
+        if not (act := find_action(action)):
+            return await ctx.send(f"There is no roleplay action called {bold(action)}!")
+        received = "received" in options and act not in SOLO_ACTIONS
+
+        guild = None if "global" in options else ctx.guild
+        async with ctx.typing():
+            await self._ensure_leaderboards(guild)
+        index = slot(act, RECEIVED if received else SENT)
+        board = self.leaderboards.get(guild.id if guild else None, index)
+
+        lines = []
+        for user_id, score in board.top(30):
+            user = guild.get_member(user_id) if guild else self.bot.get_user(user_id)
+            if guild and not user:
+                continue
+            name = user.name if user else f"Unknown user {user_id}"
+            lines.append(f"{len(lines) + 1:>3}. {name[:24]:<24} {score:>8,}")
+            if len(lines) == 10:
+                break
+        if not lines:
+            return await ctx.send("Nobody is on this leaderboard yet. Be the first one!")
+
+        emb = discord.Embed(colour=await ctx.embed_colour(), description=box("\n".join(lines)))
+        if act in SOLO_ACTIONS:
+            emb.title = f"{act.title()} leaderboard"
+        else:
+            emb.title = f"{act.title()} {'received' if received else 'sent'} leaderboard"
+        emb.set_author(name=guild.name if guild else "Global (all servers)")
+        if position := board.rank(ctx.author.id):
+            emb.set_footer(text=f"You are #{position[0]:,} of {len(board):,} with {position[1]:,}")
+        await ctx.send(embed=emb)
+
+    def _pair_lines(self, guild: discord.Guild, pairs: List[Tuple[int, int]]) -> str:
+        lines = []
+        for user_id, count in pairs:
+            member = guild.get_member(user_id)
+            name = member.name if member else f"Unknown user {user_id}"
+            lines.append(f"{len(lines) + 1}. {name[:24]:<24} {count:>6,}")
+        return box("\n".join(lines)) if lines else "Nobody yet."
+
+    @commands.guild_only()
+    @commands.command(name="rpfriends", aliases=["rpbff"])
+    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.bot_has_permissions(embed_links=True)
+    async def roleplay_friends(self, ctx: Context, *, member: discord.Member = None):
+        """See who you (or a member) share the most hugs, pats, kisses and such with."""
+        user = member or ctx.author
+        async with ctx.typing():
+            friends = await self.interactions.best_friends(ctx.guild.id, user.id)
+        emb = discord.Embed(
+            colour=await ctx.embed_colour(), description=self._pair_lines(ctx.guild, friends)
+        )
+        emb.set_author(name=f"Roleplay best friends | {user.name}")
+        await ctx.send(embed=emb)
+
+    @commands.guild_only()
+    @commands.command(name="rpwho")
+    @commands.cooldown(1, 10, commands.BucketType.member)
+    @commands.bot_has_permissions(embed_links=True)
+    async def roleplay_who(self, ctx: Context, action: str, *, member: discord.Member = None):
+        """See who you (or a member) used a roleplay action on most, and who used it on you most.
+
+        **Example:**
+            - `[p]rpwho slap` - who you slapped the most and who slapped you the most
+            - `[p]rpwho hug @member` - who that member hugs the most and is hugged by the most
+        """
+        act = find_action(action)
+        if not act or act in SOLO_ACTIONS:
+            return await ctx.send(f"There is no roleplay action called {bold(action)}!")
+        user = member or ctx.author
+        async with ctx.typing():
+            sent = await self.interactions.top(ctx.guild.id, user.id, SENT, [act])
+            received = await self.interactions.top(ctx.guild.id, user.id, RECEIVED, [act])
+        emb = discord.Embed(colour=await ctx.embed_colour())
+        emb.set_author(name=f"{act.title()} | {user.name}")
+        for name, pairs in (("Sent the most to", sent), ("Received the most from", received)):
+            emb.add_field(name=name, value=self._pair_lines(ctx.guild, pairs), inline=False)
+        await ctx.send(embed=emb)
+
+    async def _member_stats(self, guild_id: int, member_ids: List[int]) -> List[Row]:
+        return [
+            (member_id, await self.config.member_from_ids(guild_id, member_id).stats())
+            for member_id in member_ids
+        ]
+
+    def _export_rows(
+        self, loop: asyncio.AbstractEventLoop, guild: discord.Guild
+    ) -> Iterator[Row]:
+        """Stats rows of a guild's members, read from Config one batch at a time.
+
+        Iterated by the export writer in an executor thread, which fetches every
+        batch from the event loop as it gets to it, so the whole guild is never
+        held in memory at once.
+        """
+        member_ids = [member.id for member in guild.members]
+        for start in range(0, len(member_ids), READ_BATCH):
+            batch = member_ids[start : start + READ_BATCH]
+            future = asyncio.run_coroutine_threadsafe(self._member_stats(guild.id, batch), loop)
+            # bounded, so a stopped loop can't leave the executor thread waiting forever
+            yield from future.result(timeout=60)
+
+    @commands.guild_only()
+    @commands.command(name="rpexport")
+    @commands.admin_or_permissions(manage_guild=True)
+    @commands.cooldown(1, 300, commands.BucketType.guild)
+    @commands.bot_has_permissions(attach_files=True)
+    async def roleplay_export(self, ctx: Context, file_format: str = "csv"):
+        """Export the roleplay stats of every current member of this server.
+
+        `file_format` is `csv` (default) or `parquet`, if the bot owner installed pyarrow.
+        Per action totals for the whole server are posted along with the file.
+        """
+        file_format = file_format.lower()
+        if file_format not in EXPORT_FORMATS:
+            return await ctx.send_help()
+        if file_format == "parquet" and not PYARROW:
+            return await ctx.send("Parquet exports aren't available, pyarrow is not installed.")
+
+        async with ctx.typing():
+            # get buffered increments into Config so the export is complete
+            await self.counters.flush()
+            loop = asyncio.get_running_loop()
+            rows = self._export_rows(loop, ctx.guild)
+            with tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / f"roleplay-{ctx.guild.id}.{file_format}"
+                written, totals = await loop.run_in_executor(
+                    None, write_export, path, file_format, rows
+                )
+                if not written:
+                    return await ctx.send("Nobody in this server has done any roleplay yet.")
+                if path.stat().st_size > ctx.guild.filesize_limit:
+                    return await ctx.send(
+                        "The export is too large to upload here."
+                        + (" Try the `parquet` format instead." if PYARROW else "")
+                    )
+                solo = ", ".join(
+                    f"{act.lower()}: {totals[slot(act, SENT)]:,}" for act in SOLO_ACTIONS
+                )
+                await ctx.send(
+                    f"Roleplay stats of {written:,} members. Server totals ({solo}):\n"
+                    + box(stats_table(totals), "nim"),
+                    file=discord.File(str(path)),
+                )
+
+    @commands.is_owner()
+    @commands.group(name="rpgifs", invoke_without_command=True)
+    async def roleplay_gifs(self, ctx: Context):
+        """Report roleplay GIF links that are dead."""
+        all_urls = self.all_gif_urls()
+        total = len({url for pool in all_urls.values() for url in pool})
+        dead = self.gif_health.dead()
+        unchecked = total - len(self.gif_health.results)
+        summary = (
+            f"{total} GIF links: {total - len(dead) - unchecked} healthy,"
+            f" {len(dead)} dead, {unchecked} not checked yet.\n"
+        )
+        if not dead:
+            return await ctx.send(summary + "No dead GIF links found.")
+
+        lines = []
+        for name, pool in all_urls.items():
+            for url in dict.fromkeys(pool):
+                if result := dead.get(url):
+                    status = "unreachable" if result.status == UNREACHABLE else result.status
+                    lines.append(f"[{name}] {status} {url}")
+        await ctx.send(summary)
+        for page in pagify("\n".join(lines), page_length=1900):
+            await ctx.send(box(page))
+
+    @roleplay_gifs.command(name="check")
+    async def roleplay_gifs_check(self, ctx: Context, force: bool = False):
+        """Check roleplay GIF links now instead of waiting for the daily check.
+
+        Only links not checked recently are checked again, unless `force` is true.
+        """
+        urls = [url for pool in self.all_gif_urls().values() for url in pool]
+        async with ctx.typing():
+            checked = await self.gif_health.check(self.session, urls, force=force)
+        await ctx.send(
+            f"Checked {checked} GIF links, {len(self.gif_health.dead())} of them are dead."
+        )
+
+    @roleplay_gifs.command(name="mode")
+    async def roleplay_gifs_mode(self, ctx: Context, mode: str):
+        """Choose how roleplay GIFs are sent.
+
+        - `link` (default): embed links straight to the GIF hosts.
+        - `mirror`: keep local copies in the cog data folder and upload them with each embed.
+        - `reuse`: like `mirror`, but reuse Discord's link to the first upload of each GIF
+        until it expires, instead of uploading it again.
+        """
+        mode = mode.lower()
+        if mode not in GIF_MODES:
+            return await ctx.send_help()
+        self.gif_mode = mode
+        await self.config.gif_mode.set(mode)
+        await ctx.send(f"✅ Done. Roleplay GIFs will be sent in `{mode}` mode from now.")
+
+    @roleplay_gifs.command(name="mirrorsize")
+    async def roleplay_gifs_mirror_size(self, ctx: Context, megabytes: int):
+        """Set how much disk space mirrored GIFs may use, in MB. Default is 200 MB.
+
+        Least recently used GIFs are deleted first once over the limit.
+        """
+        megabytes = max(megabytes, 10)
+        self.gif_mirror.max_bytes = megabytes * 1024 * 1024
+        await self.config.gif_mirror_mb.set(megabytes)
+        removed = await asyncio.get_running_loop().run_in_executor(
+            None, self.gif_mirror.evict, self.gif_mirror.max_bytes
+        )
+        used = self.gif_mirror.total_bytes / 1024 / 1024
+        await ctx.send(
+            f"✅ Done. Mirrored GIFs can now use up to {megabytes} MB"
+            f" ({used:.1f} MB in use, removed {removed} files)."
+        )
@@ -3,7 +3,10 @@ from redbot.core.bot import Red
 
 from .steamcog import SteamCog
 
-__red_end_user_data_statement__ = "This cog does not persistently store data about users."
+__red_end_user_data_statement__ = (
+    "This cog stores your chosen Steam region and the games on your price watchlist,"
+    " if you set any."
+)
 
 
 async def setup(bot: Red):
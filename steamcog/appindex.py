@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import logging
+import re
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from .client import SteamClient
+
+logger = logging.getLogger("red.owo.steamcog")
+
+APP_LIST = "https://api.steampowered.com/ISteamApps/GetAppList/v2/"
+
+_NOT_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(name: str) -> str:
+    """Casefolded name with punctuation and repeated whitespace collapsed into single spaces."""
+    return _NOT_ALNUM.sub(" ", name.casefold()).strip()
+
+
+class AppIndex:
+    """Every Steam app ID and name in three parallel lists sorted by normalized name.
+
+    Exact and prefix lookups are binary searches. The index is kept on disk
+    as a gzipped tab separated file so restarts don't need the ~10 MB app list.
+    """
+
+    def __init__(self, path: Path, *, max_age: float = 86400) -> None:
+        self.path = path
+        self.max_age = max_age
+        self.built_at: Optional[float] = None
+        self._keys: List[str] = []
+        self._ids: List[int] = []
+        self._names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._keys)
+
+    @property
+    def stale(self) -> bool:
+        return self.built_at is None or time.time() - self.built_at > self.max_age
+
+    def clear(self) -> None:
+        self._keys, self._ids, self._names = [], [], []
+        self.built_at = None
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        start = bisect_left(self._keys, prefix)
+        # every key starting with prefix sorts before prefix + the highest code point
+        return start, bisect_left(self._keys, prefix + "\U0010ffff", start)
+
+    def resolve(self, query: str) -> Optional[int]:
+        """App ID of the only app named ``query``, or the only one whose name starts with it.
+
+        None when there is no such app or the query is ambiguous.
+        """
+        if not (key := normalize(query)):
+            return None
+        start, end = self._range(key)
+        exact = [i for i in range(start, end) if self._keys[i] == key]
+        if len(exact) == 1:
+            return self._ids[exact[0]]
+        if not exact and end - start == 1:
+            return self._ids[start]
+        return None
+
+    def complete(self, prefix: str, limit: int = 25) -> List[Tuple[int, str]]:
+        """Up to ``limit`` ``(app id, name)`` pairs whose names start with ``prefix``."""
+        if not (key := normalize(prefix)):
+            return []
+        start, end = self._range(key)
+        return [(self._ids[i], self._names[i]) for i in range(start, min(end, start + limit))]
+
+    def _apply(self, rows: List[Tuple[str, int, str]], built_at: float) -> None:
+        # called on the event loop only, so lookups never see half replaced lists
+        self._keys = [key for key, _, _ in rows]
+        self._ids = [appid for _, appid, _ in rows]
+        self._names = [name for _, _, name in rows]
+        self.built_at = built_at
+
+    def _read(self) -> Optional[Tuple[float, List[Tuple[str, int, str]]]]:
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as fp:
+                built_at = float(fp.readline())
+                rows = []
+                for line in fp:
+                    key, appid, name = line.rstrip("\n").split("\t", 2)
+                    rows.append((key, int(appid), name))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError):
+            logger.warning("Could not read the Steam app index, it will be rebuilt.")
+            return None
+        return built_at, rows
+
+    @staticmethod
+    def _parse(payload: Any) -> List[Tuple[str, int, str]]:
+        rows = []
+        for app in (payload.get("applist") or {}).get("apps") or []:
+            name = " ".join(str(app.get("name") or "").replace("\t", " ").split())
+            if (key := normalize(name)) and app.get("appid"):
+                rows.append((key, int(app["appid"]), name))
+        rows.sort()
+        return rows
+
+    def _save(self) -> None:
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            with gzip.open(tmp, "wt", encoding="utf-8") as fp:
+                fp.write(f"{self.built_at}\n")
+                fp.writelines(
+                    f"{key}\t{appid}\t{name}\n"
+                    for key, appid, name in zip(self._keys, self._ids, self._names)
+                )
+            tmp.replace(self.path)
+        except OSError:
+            logger.exception("Failed to write the Steam app index!")
+
+    async def load(self) -> bool:
+        """Load the index from disk. Returns False if there is no usable file."""
+        loaded = await asyncio.get_running_loop().run_in_executor(None, self._read)
+        if loaded is None:
+            return False
+        self._apply(loaded[1], loaded[0])
+        return True
+
+    async def refresh(self, client: SteamClient) -> int:
+        """Download the app list and rebuild the index, returns its size (0 on failure)."""
+        data = await client.get(APP_LIST, ttl=0)
+        if isinstance(data, int) or not isinstance(data, dict):
+            logger.info(f"Could not download the Steam app list: {data!r}")
+            return 0
+        loop = asyncio.get_running_loop()
+        # sorting ~200k names is a few hundred ms of CPU, keep it off the event loop
+        rows = await loop.run_in_executor(None, self._parse, data)
+        if not rows:
+            return 0
+        self._apply(rows, time.time())
+        await loop.run_in_executor(None, self._save)
+        return len(rows)
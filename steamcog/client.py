@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+import aiohttp
+
+logger = logging.getLogger("red.owo.steamcog")
+
+USER_AGENT = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    " (KHTML, like Gecko) Chrome/103.0.0.0 Safari/537.36"
+}
+
+CHEAPSHARK = "https://www.cheapshark.com"
+APPDETAILS = "https://store.steampowered.com/api/appdetails"
+STORESEARCH = "https://store.steampowered.com/api/storesearch"
+FEATURED = "https://store.steampowered.com/api/featuredcategories"
+
+# seconds a successful response stays cached, endpoints not listed here aren't cached
+ENDPOINT_TTLS: Dict[str, float] = {
+    APPDETAILS: 6 * 3600,
+    STORESEARCH: 10 * 60,
+    f"{CHEAPSHARK}/api/1.0/games": 10 * 60,
+    f"{CHEAPSHARK}/api/1.0/deals": 5 * 60,
+}
+# price only appdetails requests, keyed separately since prices move faster
+PRICE_TTL = 3600
+# the region whose full appdetails are shared by every other region
+BASE_REGION = "US"
+
+
+class ResponseCache:
+    """Decoded JSON responses keyed by URL and query params, each with its own expiry.
+
+    Cached values are shared between callers, so treat them as read-only.
+    """
+
+    def __init__(self, *, maxsize: int = 2048) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: Dict[str, Tuple[float, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        return f"{url}?{urlencode(sorted(params.items()))}" if params else url
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._data.pop(key, None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        if len(self._data) >= self.maxsize and key not in self._data:
+            self.evict_expired()
+            if len(self._data) >= self.maxsize:
+                del self._data[min(self._data, key=lambda k: self._data[k][0])]
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    def evict_expired(self) -> int:
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at < now]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+
+class SteamClient:
+    """One long-lived session for every Steam and CheapShark request the cog makes.
+
+    Successful responses are cached per URL and params for the endpoint's TTL,
+    and concurrent requests for the same thing share one in-flight fetch.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession) -> None:
+        self.session = session
+        self.cache = ResponseCache()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def _fetch(self, url: str, params: Optional[Dict[str, Any]]) -> Union[int, Any]:
+        try:
+            async with self.session.get(url, headers=USER_AGENT, params=params) as resp:
+                if resp.status != 200:
+                    logger.info(f"{url} sent non 200 response code: {resp.status}")
+                    return resp.status
+                return await resp.json(content_type=None)
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            return 408
+        except ValueError:
+            # a 200 with an HTML error page or captcha instead of JSON
+            logger.info(f"{url} sent a response that isn't valid JSON")
+            return 502
+
+    async def get(
+        self, url: str, *, params: Optional[Dict[str, Any]] = None, ttl: Optional[float] = None
+    ) -> Union[int, Any]:
+        """Returns decoded JSON on success, otherwise an HTTP status code.
+
+        408 stands for a timeout and 502 for a response that wasn't valid JSON.
+        """
+        ttl = ENDPOINT_TTLS.get(url, 0) if ttl is None else ttl
+        key = self.cache.key(url, params)
+        if ttl and (cached := self.cache.get(key)) is not None:
+            return cached
+        if (pending := self._inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # only fetch it ourselves if it was the other request that got cancelled
+                if not pending.cancelled():
+                    raise
+
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            data = await self._fetch(url, params)
+            if ttl and not isinstance(data, int) and data:
+                self.cache.put(key, data, ttl)
+            future.set_result(data)
+            return data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # nobody may be waiting on it, don't let asyncio complain about that
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    @staticmethod
+    def _app_data(payload: Union[int, Any], appid: int) -> Union[int, Any]:
+        if isinstance(payload, int):
+            return payload
+        entry = (payload or {}).get(str(appid)) or {}
+        if not entry.get("success"):
+            return 404
+        data = entry.get("data")
+        # a shallow copy, so callers adding or replacing keys can't change the cached response
+        return dict(data) if isinstance(data, dict) else data
+
+    async def price_overview(self, appid: int, region: str) -> Union[int, Dict[str, Any]]:
+        """Just the ``price_overview`` of an app for a region, empty if it has no price there."""
+        payload = await self.get(
+            APPDETAILS,
+            params={"appids": str(appid), "cc": region, "filters": "price_overview"},
+            ttl=PRICE_TTL,
+        )
+        data = self._app_data(payload, appid)
+        if isinstance(data, int):
+            return data
+        # free games come back with an empty list instead of an object
+        return dict(data.get("price_overview") or {}) if isinstance(data, dict) else {}
+
+    async def appdetails(
+        self, appid: int, region: str = BASE_REGION
+    ) -> Union[int, Dict[str, Any]]:
+        """Full app details priced for ``region``.
+
+        Everything but the price is fetched once for :data:`BASE_REGION` and
+        shared, other regions only add a small price only request on top.
+        """
+        params = {"appids": str(appid), "l": "en", "cc": BASE_REGION, "json": "1"}
+        base = self._app_data(await self.get(APPDETAILS, params=params), appid)
+        if base == 404 and region != BASE_REGION:
+            # not sold in the base region, fall back to a full request for this one
+            params["cc"] = region
+            return self._app_data(await self.get(APPDETAILS, params=params), appid)
+        if isinstance(base, int) or region == BASE_REGION:
+            return base
+        base.pop("price_overview", None)
+        price = await self.price_overview(appid, region)
+        if isinstance(price, dict) and price:
+            base["price_overview"] = price
+        return base
+
+    async def regional_prices(
+        self, appid: int, regions: Iterable[str], *, concurrency: int = 5
+    ) -> Dict[str, Union[int, Dict[str, Any]]]:
+        """``price_overview`` for each region, at most ``concurrency`` requests at a time."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(region: str) -> Union[int, Dict[str, Any]]:
+            async with semaphore:
+                return await self.price_overview(appid, region)
+
+        regions = list(dict.fromkeys(regions))
+        prices = await asyncio.gather(*(fetch(region) for region in regions))
+        return dict(zip(regions, prices))
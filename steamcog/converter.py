@@ -1,45 +1,31 @@
 import asyncio
 import contextlib
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional
 
-import aiohttp
 import discord
 from redbot.core import commands
 from redbot.core.utils.chat_formatting import humanize_number as nfmt
 
-from .stores import AVAILABLE_REGIONS
-
-USER_AGENT = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    " (KHTML, like Gecko) Chrome/103.0.0.0 Safari/537.36"
-}
-
-
-async def request(url: str, **kwargs) -> Union[int, Dict[str, Any]]:
-    params = kwargs.get("params")
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=USER_AGENT, params=params) as resp:
-                if resp.status != 200:
-                    return resp.status
-                return await resp.json()
-    except (asyncio.TimeoutError, aiohttp.ClientError):
-        return 408
+from .client import CHEAPSHARK, STORESEARCH
+from .regions import REGIONS
 
 
 class RegionConverter(commands.Converter):
 
     async def convert(self, ctx: commands.Context, argument: str) -> str:
-        if AVAILABLE_REGIONS.get(argument):
-            return AVAILABLE_REGIONS[argument]
-        elif argument.upper() in AVAILABLE_REGIONS.values():
-            return argument.upper()
-        else:
-            raise commands.BadArgument(
-                "❌ You provided either an invalid country name or"
-                " an incorrect 2 letter ISO3166 region code.\n"
-                "<https://en.wikipedia.org/wiki/List_of_ISO_3166_country_codes>"
-            )
+        if region := REGIONS.resolve(argument):
+            return region
+        message = (
+            "❌ You provided either an invalid country name or"
+            " an incorrect 2 letter ISO3166 region code.\n"
+        )
+        if suggestions := REGIONS.suggest(argument):
+            message += "Did you mean: " + ", ".join(
+                f"**{name}** (`{code}`)" for code, name in suggestions
+            ) + "?\n"
+        raise commands.BadArgument(
+            message + "<https://en.wikipedia.org/wiki/List_of_ISO_3166_country_codes>"
+        )
 
 
 class QueryConverter(commands.Converter):
@@ -50,10 +36,11 @@ class QueryConverter(commands.Converter):
             return 1599340
 
         cog = ctx.bot.get_cog("SteamCog")
+        if cog.app_index.ready and (appid := cog.app_index.resolve(argument)):
+            return appid
         user_region = (await cog.config.user(ctx.author).region()) or "US"
-        data = await request(
-            "https://store.steampowered.com/api/storesearch",
-            params={"cc": user_region, "l": "en", "term": argument.lower()}
+        data = await cog.client.get(
+            STORESEARCH, params={"cc": user_region, "l": "en", "term": argument.lower()}
         )
         if type(data) == int:
             raise commands.BadArgument(f"⚠ API sent response code: https://http.cat/{data}")
@@ -111,17 +98,20 @@ class QueryConverter(commands.Converter):
         return data["items"][int(choice.content.strip()) - 1].get("id")
 
 
-class GamedealsConverter(commands.Converter):
+class CheapSharkGameConverter(commands.Converter):
+    """Search CheapShark games by title and let the user pick one, gives the game's data."""
 
-    async def convert(self, ctx: commands.Context, argument: str) -> int:
-        url = f"https://www.cheapshark.com/api/1.0/games?title={argument.lower()}"
-        data = await request(url)
+    async def convert(self, ctx: commands.Context, argument: str) -> Dict[str, Any]:
+        cog = ctx.bot.get_cog("SteamCog")
+        data = await cog.client.get(
+            f"{CHEAPSHARK}/api/1.0/games", params={"title": argument.lower()}
+        )
         if type(data) == int:
             raise commands.BadArgument(f"⚠ API sent response code: https://http.cat/{data}")
         if not data or len(data) == 0:
             raise commands.BadArgument("❌ No results found.")
         if len(data) == 1:
-            return data[0].get("cheapestDealID")
+            return data[0]
 
         # https://github.com/Sitryk/sitcogsv3/blob/master/lyrics/lyrics.py#L142
         items = "\n".join(
@@ -151,4 +141,10 @@ class GamedealsConverter(commands.Converter):
 
         with contextlib.suppress(discord.NotFound, discord.HTTPException):
             await prompt.delete()
-        return data[int(choice.content.strip()) - 1].get("cheapestDealID")
+        return data[int(choice.content.strip()) - 1]
+
+
+class GamedealsConverter(CheapSharkGameConverter):
+
+    async def convert(self, ctx: commands.Context, argument: str) -> str:
+        return (await super().convert(ctx, argument)).get("cheapestDealID")
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, DefaultDict, Dict, List, Mapping, Optional, Tuple
+
+from .client import CHEAPSHARK, SteamClient
+
+logger = logging.getLogger("red.owo.steamcog")
+
+DEAL_SORTS = (
+    "title",
+    "savings",
+    "price",
+    "metacritic",
+    "reviews",
+    "release",
+    "store",
+    "recent",
+    "deal rating",
+)
+# deals posted per channel per poll at most, anything beyond that is skipped
+MAX_POSTS_PER_POLL = 5
+
+
+@dataclass(frozen=True)
+class FeedSettings:
+    sort_by: str = "recent"
+    max_price: Optional[float] = None
+
+    @property
+    def params(self) -> Dict[str, str]:
+        params = {"sortBy": self.sort_by, "pageSize": "60"}
+        if self.max_price is not None:
+            params["upperPrice"] = f"{self.max_price:g}"
+        return params
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"sort_by": self.sort_by, "max_price": self.max_price}
+
+
+class DealsFeed:
+    """Finds deals that are new, or got cheaper, since the last look at a deals listing.
+
+    Channels with the same settings share one listing fetch and snapshot per
+    poll. The first fetch of a listing only records it, so adding a feed
+    doesn't flood the channel with everything that's already on sale.
+    """
+
+    def __init__(self, client: SteamClient, *, forget_after: float = 7 * 86400) -> None:
+        self.client = client
+        self.forget_after = forget_after
+        # settings -> dealID -> (sale price, last seen at)
+        self.snapshots: Dict[FeedSettings, Dict[str, Tuple[float, float]]] = {}
+
+    def _diff(self, settings: FeedSettings, deals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        now = time.time()
+        first_look = settings not in self.snapshots
+        seen = self.snapshots.setdefault(settings, {})
+        fresh = []
+        for deal in deals:
+            if not (deal_id := deal.get("dealID")):
+                continue
+            try:
+                price = float(deal.get("salePrice"))
+            except (TypeError, ValueError):
+                continue
+            previous = seen.get(deal_id)
+            if not first_look and (previous is None or price < previous[0]):
+                fresh.append(deal)
+            seen[deal_id] = (price, now)
+        # deals that dropped out of the listing for long enough count as new again
+        for deal_id in [k for k, (_, at) in seen.items() if now - at > self.forget_after]:
+            del seen[deal_id]
+        return fresh
+
+    async def poll(self, feeds: Mapping[int, FeedSettings]) -> Dict[int, List[Dict[str, Any]]]:
+        """New or cheaper deals per channel ID, with one fetch per distinct settings."""
+        channels: DefaultDict[FeedSettings, List[int]] = defaultdict(list)
+        for channel_id, settings in feeds.items():
+            channels[settings].append(channel_id)
+        # settings nobody uses anymore don't need their snapshot
+        for settings in set(self.snapshots) - set(channels):
+            del self.snapshots[settings]
+
+        results: Dict[int, List[Dict[str, Any]]] = {}
+        for settings, channel_ids in channels.items():
+            data = await self.client.get(
+                f"{CHEAPSHARK}/api/1.0/deals", params=settings.params, ttl=0
+            )
+            if isinstance(data, int) or not isinstance(data, list):
+                logger.info(f"Could not fetch CheapShark deals for {settings}: {data!r}")
+                continue
+            fresh = self._diff(settings, data)[:MAX_POSTS_PER_POLL]
+            for channel_id in channel_ids:
+                results[channel_id] = fresh
+        return results
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict, Tuple, Union
+
+from .client import FEATURED, SteamClient
+
+logger = logging.getLogger("red.owo.steamcog")
+
+
+class FeaturedSnapshots:
+    """In-memory ``featuredcategories`` snapshots per region.
+
+    Commands are served from the snapshots and :meth:`refresh` replaces them
+    on a schedule, but only for regions someone asked for in the last
+    ``keep_for`` seconds. A region nobody asked for yet is fetched on demand.
+    """
+
+    def __init__(self, client: SteamClient, *, keep_for: float = 7 * 86400) -> None:
+        self.client = client
+        self.keep_for = keep_for
+        # region -> (fetched at, data)
+        self.snapshots: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._requested: Dict[str, float] = {}
+
+    async def _fetch(self, region: str) -> Union[int, Dict[str, Any]]:
+        data = await self.client.get(
+            FEATURED, params={"l": "en", "cc": region, "json": "1"}, ttl=0
+        )
+        if not isinstance(data, int) and isinstance(data, dict) and data:
+            self.snapshots[region] = (time.time(), data)
+        return data
+
+    async def get(self, region: str) -> Union[int, Dict[str, Any]]:
+        self._requested[region] = time.time()
+        if (snapshot := self.snapshots.get(region)) is not None:
+            return snapshot[1]
+        return await self._fetch(region)
+
+    async def refresh(self) -> int:
+        """Refetch every region in use, returns how many were refreshed."""
+        cutoff = time.time() - self.keep_for
+        for region, requested_at in list(self._requested.items()):
+            if requested_at < cutoff:
+                del self._requested[region]
+                self.snapshots.pop(region, None)
+        refreshed = 0
+        for region in list(self._requested):
+            # a failed refresh keeps serving the previous snapshot
+            if not isinstance(await self._fetch(region), int):
+                refreshed += 1
+        return refreshed
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import contextlib
+from typing import Any, Awaitable, Callable, Dict
+
+import discord
+from redbot.core import commands
+from redbot.core.utils.menus import close_menu, menu
+
+Control = Callable[..., Awaitable[Any]]
+
+
+class SteamPages:
+    """The main ``steam`` embed plus preview pages built on demand.
+
+    Preview embeds are only built the first time someone turns to them and
+    are kept for later menus of the same app. Each menu gets its own
+    controls from :meth:`controls`, which track the page it's on and hand
+    Red's ``menu`` just that one page.
+    """
+
+    def __init__(
+        self, main: discord.Embed, count: int, make_page: Callable[[int], discord.Embed]
+    ) -> None:
+        self.count = count
+        self._make_page = make_page
+        self._built: Dict[int, discord.Embed] = {0: main}
+
+    def page(self, index: int) -> discord.Embed:
+        if (embed := self._built.get(index)) is None:
+            embed = self._built[index] = self._make_page(index)
+        return embed
+
+    def controls(self) -> Dict[str, Control]:
+        position = 0
+
+        async def turn(
+            step: int, ctx: commands.Context, message: discord.Message, timeout: float, emoji
+        ) -> Any:
+            nonlocal position
+            if message.channel.permissions_for(ctx.me).manage_messages:
+                with contextlib.suppress(discord.HTTPException):
+                    await message.remove_reaction(emoji, ctx.author)
+            position = (position + step) % self.count
+            return await menu(
+                ctx, [self.page(position)], controls, message=message, timeout=timeout
+            )
+
+        async def previous_page(ctx, pages, controls, message, page, timeout, emoji, **kwargs):
+            return await turn(-1, ctx, message, timeout, emoji)
+
+        async def next_page(ctx, pages, controls, message, page, timeout, emoji, **kwargs):
+            return await turn(1, ctx, message, timeout, emoji)
+
+        controls: Dict[str, Control] = {
+            "\N{LEFTWARDS BLACK ARROW}\N{VARIATION SELECTOR-16}": previous_page,
+            "\N{CROSS MARK}": close_menu,
+            "\N{BLACK RIGHTWARDS ARROW}\N{VARIATION SELECTOR-16}": next_page,
+        }
+        if self.count == 1:
+            return {"\N{CROSS MARK}": close_menu}
+        return controls
+
+    async def send(self, ctx: commands.Context, *, timeout: float = 90.0) -> Any:
+        return await menu(ctx, [self.page(0)], self.controls(), timeout=timeout)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import re
+from difflib import get_close_matches
+from typing import Dict, List, Optional, Tuple
+
+from .stores import AVAILABLE_REGIONS
+
+# common names people use that aren't the ones in AVAILABLE_REGIONS
+ALIASES: Dict[str, str] = {
+    "usa": "US",
+    "america": "US",
+    "united states of america": "US",
+    "uk": "GB",
+    "britain": "GB",
+    "great britain": "GB",
+    "england": "GB",
+    "scotland": "GB",
+    "wales": "GB",
+    "korea": "KR",
+    "republic of korea": "KR",
+    "russia": "RU",
+    "vietnam": "VN",
+    "uae": "AE",
+    "emirates": "AE",
+    "holland": "NL",
+    "czech republic": "CZ",
+    "turkiye": "TR",
+    "brunei": "BN",
+    "syria": "SY",
+    "macedonia": "MK",
+    "drc": "CD",
+    "swaziland": "SZ",
+    "cape verde": "CV",
+    "ivory coast": "CI",
+    "burma": "MM",
+}
+
+_NOT_ALPHA = re.compile(r"[^a-z]+")
+
+
+def normalize(name: str) -> str:
+    return _NOT_ALPHA.sub(" ", name.casefold()).strip()
+
+
+class RegionIndex:
+    """Country names, aliases and ISO 3166 alpha-2 codes of the regions Steam prices in.
+
+    Lookups in both directions are plain dict hits, and names that don't
+    match anything get fuzzy suggestions.
+    """
+
+    def __init__(self, regions: Dict[str, str], aliases: Dict[str, str]) -> None:
+        self.by_name: Dict[str, str] = {}
+        self.names: Dict[str, str] = {}
+        for key, code in regions.items():
+            name = normalize(key)
+            self.by_name[name] = code
+            self.names.setdefault(code, name.title())
+        for alias, code in aliases.items():
+            if code in self.names:
+                self.by_name.setdefault(normalize(alias), code)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.names
+
+    def name(self, code: str) -> str:
+        return self.names.get(code.upper(), code.upper())
+
+    def resolve(self, argument: str) -> Optional[str]:
+        """Region code for a 2 letter code, a country name or an alias. None if unknown."""
+        if len(argument.strip()) == 2 and argument.strip().upper() in self.names:
+            return argument.strip().upper()
+        return self.by_name.get(normalize(argument))
+
+    def suggest(self, argument: str, n: int = 3) -> List[Tuple[str, str]]:
+        """Up to ``n`` ``(code, country name)`` pairs with names close to ``argument``."""
+        matches = get_close_matches(normalize(argument), self.by_name, n=n * 2, cutoff=0.6)
+        codes = list(dict.fromkeys(self.by_name[match] for match in matches))[:n]
+        return [(code, self.names[code]) for code in codes]
+
+
+REGIONS = RegionIndex(AVAILABLE_REGIONS, ALIASES)
@@ -1,24 +1,49 @@
+import asyncio
+import contextlib
+import logging
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote
 
+import aiohttp
 import discord
+from discord.ext import tasks
 from html2text import html2text
 from redbot.core import Config, commands
 from redbot.core.bot import Red
-from redbot.core.utils.chat_formatting import humanize_list
+from redbot.core.data_manager import cog_data_path
+from redbot.core.utils.chat_formatting import box, humanize_list
 from redbot.core.utils.menus import DEFAULT_CONTROLS, close_menu, menu
 
-from .converter import GamedealsConverter, RegionConverter, QueryConverter, request
-from .stores import AVAILABLE_REGIONS, STORES
-
-CHEAPSHARK = "https://www.cheapshark.com"
+from .appindex import AppIndex
+from .client import CHEAPSHARK, ResponseCache, SteamClient
+from .converter import (
+    CheapSharkGameConverter,
+    GamedealsConverter,
+    QueryConverter,
+    RegionConverter,
+)
+from .dealsfeed import DEAL_SORTS, DealsFeed, FeedSettings
+from .featured import FeaturedSnapshots
+from .pages import SteamPages
+from .regions import REGIONS
+from .stores import PRICE_REGIONS, StoreDirectory
+from .watchlist import MAX_WATCHES_PER_USER, PriceUpdate, PriceWatcher, WatchEntry
+
+logger = logging.getLogger("red.owo.steamcog")
+
+PLATFORM_REQUIREMENTS = {
+    "windows": "pc_requirements",
+    "mac": "mac_requirements",
+    "linux": "linux_requirements",
+}
 
 
 class SteamCog(commands.Cog):
     """Fetch data on a Steam game and cheap game deals for PC game(s)."""
 
     __authors__ = ["ow0x"]
-    __version__ = "2.1.0"
+    __version__ = "2.2.0"
 
     def format_help_for_context(self, ctx: commands.Context) -> str:
         """Thanks Sinbad."""
@@ -31,12 +56,163 @@ class SteamCog(commands.Cog):
     def __init__(self, bot: Red) -> None:
         self.bot = bot
         self.config = Config.get_conf(self, 357059159021060097, force_registration=True)
-        default_user = {"region": None}
+        # watchlist: {cheapshark game id: WatchEntry.to_dict()}
+        default_user = {"region": None, "watchlist": {}}
         self.config.register_user(**default_user)
+        self.config.register_global(app_index=False)
+        # deals_feed: FeedSettings.to_dict() of the channel's feed, None when it has none
+        self.config.register_channel(deals_feed=None)
+        self.client = SteamClient(aiohttp.ClientSession())
+        self.stores = StoreDirectory()
+        self._refresh_stores.start()
+        self.featured = FeaturedSnapshots(self.client)
+        self._refresh_featured.start()
+        self.watcher = PriceWatcher(self.client)
+        self._watchlist = asyncio.create_task(self._load_watchlist())
+        self._poll_prices.start()
+        self.app_index = AppIndex(cog_data_path(self) / "steam_apps.tsv.gz")
+        # built `steam` command pages by app, region and embed colour
+        self._steam_pages = ResponseCache(maxsize=256)
+        # html2text output by "appid:platform"
+        self._requirements = ResponseCache(maxsize=512)
+        self._refresh_app_index.start()
+        self.deals_feed = DealsFeed(self.client)
+        self._poll_deals_feed.start()
+
+    async def cog_unload(self) -> None:
+        self._refresh_app_index.cancel()
+        self._refresh_stores.cancel()
+        self._refresh_featured.cancel()
+        self._watchlist.cancel()
+        self._poll_prices.cancel()
+        self._poll_deals_feed.cancel()
+        await self.client.session.close()
+
+    @tasks.loop(hours=12)
+    async def _refresh_stores(self) -> None:
+        try:
+            await self.stores.refresh(self.client)
+        except Exception:
+            logger.exception("Error while refreshing the CheapShark store directory!")
 
-    async def red_delete_data_for_user(self, **kwargs) -> None:
-        """Nothing to delete"""
-        pass
+    @tasks.loop(hours=3)
+    async def _refresh_featured(self) -> None:
+        try:
+            await self.featured.refresh()
+        except Exception:
+            logger.exception("Error while refreshing Steam featured snapshots!")
+
+    @tasks.loop(hours=1)
+    async def _refresh_app_index(self) -> None:
+        try:
+            if not await self.config.app_index():
+                return
+            if not self.app_index.ready:
+                await self.app_index.load()
+            if self.app_index.stale:
+                await self.app_index.refresh(self.client)
+        except Exception:
+            logger.exception("Error while refreshing the Steam app index!")
+
+    async def _load_watchlist(self) -> None:
+        self.watcher.load(await self.config.all_users())
+
+    @tasks.loop(minutes=1)
+    async def _poll_prices(self) -> None:
+        # an exception escaping a tick would stop the loop until the cog is reloaded
+        try:
+            updates = await self.watcher.poll()
+        except Exception:
+            logger.exception("Error while polling watchlist prices!")
+            return
+        for update in updates:
+            # the watch may have been removed, or its user's data deleted, while polling
+            if not self.watcher.is_current(update):
+                continue
+            try:
+                await self.config.user_from_id(update.user_id).watchlist.set_raw(
+                    update.game_id, value=update.entry.to_dict()
+                )
+                if update.dropped:
+                    await self._notify_price_drop(update)
+            except Exception:
+                logger.exception(f"Error while applying a watchlist update for {update.user_id}")
+
+    @_poll_prices.before_loop
+    async def _before_poll_prices(self) -> None:
+        await self.bot.wait_until_ready()
+        await self._watchlist
+
+    async def _notify_price_drop(self, update: PriceUpdate) -> None:
+        user = self.bot.get_user(update.user_id)
+        if not user:
+            return
+        em = discord.Embed(colour=discord.Colour.blurple(), title=update.entry.title)
+        if update.steam_app_id:
+            em.url = f"https://store.steampowered.com/app/{update.steam_app_id}"
+        em.set_author(name="Price drop on your watchlist!")
+        em.set_thumbnail(url=update.thumb or "")
+        price = f"**{update.price:.2f} USD**"
+        if update.retail_price:
+            price += f"\n~~{update.retail_price:.2f} USD~~"
+        em.add_field(name="Deal Price", value=price)
+        em.add_field(name="Your Target", value=f"{update.entry.target:.2f} USD")
+        if update.deal_id and update.store_id:
+            em.add_field(
+                name="Deal available on",
+                value=f"[{self.stores[update.store_id]}]"
+                f"({CHEAPSHARK}/redirect?dealID={update.deal_id})",
+            )
+        em.set_footer(text="Data provided by CheapShark API")
+        with contextlib.suppress(discord.HTTPException):
+            await user.send(embed=em)
+
+    @tasks.loop(minutes=30)
+    async def _poll_deals_feed(self) -> None:
+        # an exception escaping a tick would stop every channel's feed until a reload
+        try:
+            feeds = {}
+            for channel_id, data in (await self.config.all_channels()).items():
+                if not data.get("deals_feed"):
+                    continue
+                try:
+                    feeds[channel_id] = FeedSettings(**data["deals_feed"])
+                except (TypeError, ValueError):
+                    logger.warning(f"Skipping malformed deals feed settings of {channel_id}")
+            if not feeds:
+                return
+            results = await self.deals_feed.poll(feeds)
+        except Exception:
+            logger.exception("Error while polling CheapShark deal feeds!")
+            return
+        for channel_id, deals in results.items():
+            if not deals:
+                continue
+            try:
+                await self._post_deals(channel_id, deals)
+            except Exception:
+                logger.exception(f"Error while posting deals feed in channel {channel_id}")
+
+    @_poll_deals_feed.before_loop
+    async def _before_poll_deals_feed(self) -> None:
+        await self.bot.wait_until_ready()
+
+    async def _post_deals(self, channel_id: int, deals: List[Dict[str, Any]]) -> None:
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            return
+        guild = getattr(channel, "guild", None)
+        if guild and not channel.permissions_for(guild.me).embed_links:
+            return
+        colour = await self.bot.get_embed_colour(channel)
+        for data in deals:
+            em = self.latestdeals_embed(data, stores=self.stores, colour=colour)
+            with contextlib.suppress(discord.HTTPException):
+                await channel.send(embed=em)
+
+    async def red_delete_data_for_user(self, *, requester, user_id: int) -> None:
+        await self.config.user_from_id(user_id).clear()
+        self.watcher.forget_user(user_id)
 
     def timestamp(self, date_string: str) -> str:
         try:
@@ -121,6 +297,25 @@ class SteamCog(commands.Cog):
         )
         return em
 
+    def steam_pages(self, app: Dict[str, Any], appid: int, colour: discord.Colour) -> SteamPages:
+        screenshots = app.get("screenshots") or []
+
+        def make_preview(index: int) -> discord.Embed:
+            embed = self.game_previews_embed(
+                screenshots[index - 1].get("path_full") or "",
+                colour=colour,
+                id=appid,
+                title=app["name"],
+            )
+            embed.set_footer(
+                text=f"Preview {index} of {len(screenshots)}",
+                icon_url="https://i.imgur.com/xxr2UBZ.png",
+            )
+            return embed
+
+        main = self.steam_embed(app, id=appid, colour=colour)
+        return SteamPages(main, len(screenshots) + 1, make_preview)
+
     @commands.group(invoke_without_command=True)
     @commands.cooldown(1, 5, commands.BucketType.user)
     @commands.bot_has_permissions(embed_links=True, read_message_history=True)
@@ -133,36 +328,67 @@ class SteamCog(commands.Cog):
         Once set, the bot will show pricing for your region in command embed.
         """
         async with ctx.typing():
-            # TODO: remove this temp fix once game is released
-            base_url = "https://store.steampowered.com/api/appdetails"
             user_region = (await self.config.user(ctx.author).region()) or "US"
-            data = await request(
-                base_url, params={"appids": str(query), "l": "en", "cc": user_region, "json": "1"}
-            )
-            if type(data) == int:
-                await ctx.send(f"⚠ API sent response code: https://http.cat/{data}")
-                return
-            if not data:
-                return await ctx.send("Something went wrong while querying Steam.")
             colour = await ctx.embed_colour()
-            app_data = data[f"{query}"].get("data")
-
-            pages = [self.steam_embed(app_data, id=query, colour=colour)]
-            if screenshots := app_data.get("screenshots"):
-                for i, preview in enumerate(screenshots, start=1):
-                    embed = self.game_previews_embed(
-                        preview.get("path_full") or "",
-                        colour=colour,
-                        id=query,
-                        title=app_data["name"],
-                    )
-                    embed.set_footer(
-                        text=f"Preview {i} of {len(app_data['screenshots'])}",
-                        icon_url="https://i.imgur.com/xxr2UBZ.png",
-                    )
-                    pages.append(embed)
-
-        await menu(ctx, pages, DEFAULT_CONTROLS, timeout=90.0)
+            key = f"{query}:{user_region}:{colour.value}"
+            if (pages := self._steam_pages.get(key)) is None:
+                app_data = await self.client.appdetails(query, user_region)
+                if type(app_data) == int:
+                    await ctx.send(f"⚠ API sent response code: https://http.cat/{app_data}")
+                    return
+                if not app_data:
+                    return await ctx.send("Something went wrong while querying Steam.")
+                pages = self.steam_pages(app_data, query, colour)
+                self._steam_pages.put(key, pages, 3600)
+
+        await pages.send(ctx, timeout=90.0)
+
+    @steam.command(name="compare", aliases=["prices"])
+    @commands.cooldown(1, 30, commands.BucketType.user)
+    # up to 39 Steam requests each, one at a time bot wide so the other commands keep working
+    @commands.max_concurrency(1, commands.BucketType.default, wait=True)
+    @commands.bot_has_permissions(embed_links=True)
+    async def steam_compare_prices(self, ctx: commands.Context, *, query: QueryConverter):
+        """Compare the price of a Steam game across Steam's pricing regions.
+
+        Prices are shown in each region's own currency, cheapest first per currency.
+        """
+        async with ctx.typing():
+            app_data = await self.client.appdetails(query)
+            if type(app_data) == int:
+                await ctx.send(f"⚠ API sent response code: https://http.cat/{app_data}")
+                return
+            if app_data.get("is_free"):
+                return await ctx.send(f"**{app_data['name']}** is free to play everywhere!")
+            user_region = (await self.config.user(ctx.author).region()) or "US"
+            prices = await self.client.regional_prices(query, (user_region, *PRICE_REGIONS))
+
+            rows = []
+            for region, price in prices.items():
+                if not isinstance(price, dict) or not price.get("final"):
+                    continue
+                rows.append((price.get("currency") or "", price["final"], region, price))
+            if not rows:
+                return await ctx.send("This game has no price in any of Steam's regions.")
+            rows.sort()
+
+            lines = [f"{'':2} {'Currency':<8} {'Price':>16} {'Off':>4}"]
+            for currency, _, region, price in rows:
+                mark = "*" if region == user_region else " "
+                formatted = price.get("final_formatted") or ""
+                discount = f"{price['discount_percent']}%" if price.get("discount_percent") else ""
+                lines.append(f"{region:2}{mark}{currency:<8} {formatted[:16]:>16} {discount:>4}")
+            em = discord.Embed(
+                colour=await ctx.embed_colour(),
+                title=app_data["name"],
+                url=f"https://store.steampowered.com/app/{query}",
+                description=box("\n".join(lines)),
+            )
+            em.set_footer(
+                text=f"* your region • {len(rows)} regions",
+                icon_url="https://i.imgur.com/xxr2UBZ.png",
+            )
+        await ctx.send(embed=em)
 
     @steam.command(name="featuredcategories", aliases=["featuredcategory", "featuredcat"])
     async def steam_featured_categories(self, ctx: commands.Context, *, category: str):
@@ -180,9 +406,8 @@ class SteamCog(commands.Cog):
             return await ctx.send_help()
 
         async with ctx.typing():
-            base_url = "https://store.steampowered.com/api/featuredcategories"
             user_region = (await self.config.user(ctx.author).region()) or "US"
-            data = await request(base_url, params={"l": "en", "cc": user_region, "json": "1"})
+            data = await self.featured.get(user_region)
             if type(data) == int:
                 await ctx.send(f"⚠ API sent response code: https://http.cat/{data}")
                 return
@@ -224,6 +449,25 @@ class SteamCog(commands.Cog):
 
         await menu(ctx, pages, DEFAULT_CONTROLS, timeout=120.0)
 
+    @commands.is_owner()
+    @steam.command(name="appindex", hidden=True)
+    async def steam_app_index(self, ctx: commands.Context, enabled: bool):
+        """Keep a local index of every Steam app name to resolve game queries offline.
+
+        The index takes some disk space and memory (tens of MB) and is refreshed daily.
+        Exact and unambiguous prefix matches skip the Steam search and the result picker.
+        """
+        await self.config.app_index.set(enabled)
+        if not enabled:
+            self.app_index.clear()
+            return await ctx.send("✅ Local Steam app index disabled.")
+        async with ctx.typing():
+            if not (self.app_index.ready or await self.app_index.load()) or self.app_index.stale:
+                await self.app_index.refresh(self.client)
+        if not self.app_index.ready:
+            return await ctx.send("Enabled, but the Steam app list couldn't be fetched yet.")
+        await ctx.send(f"✅ Local Steam app index enabled with {len(self.app_index):,} apps.")
+
     @steam.command(name="setmyregion")
     @commands.cooldown(1, 15, commands.BucketType.user)
     async def steam_set_my_region(self, ctx: commands.Context, *, region: RegionConverter):
@@ -238,13 +482,12 @@ class SteamCog(commands.Cog):
             - `[p]steam setmyregion DE`
             - `[p]steam setmyregion United States`
         """
-        country_name = [k for k, v in AVAILABLE_REGIONS.items() if v == region]
         user_region = await self.config.user(ctx.author).region()
         action = "changed to" if user_region else "set to"
         await self.config.user(ctx.author).region.set(region)
         await ctx.send(
             f"✅ Success! Your region has now been {action} :flag_{region.lower()}:"
-            f" **{country_name[0].replace('_', ' ').title()}**!\n"
+            f" **{REGIONS.name(region)}**!\n"
             f"It will be used to show game price for your set region"
             f" in `{ctx.clean_prefix}steam` command embeds from now.\n"
             "If not available, the price will default to USD otherwise.\n"
@@ -252,34 +495,45 @@ class SteamCog(commands.Cog):
         )
 
     @staticmethod
-    def game_requirements_embed(app: Dict[str, Any], **kwargs) -> List[discord.Embed]:
-        pages = []
-        platform_mapping = {
-            "windows": "pc_requirements",
-            "mac": "mac_requirements",
-            "linux": "linux_requirements",
-        }
+    def requirements_text(requirements: Dict[str, str]) -> str:
+        all_reqs = []
+        for level in ("minimum", "recommended"):
+            if html := requirements.get(level):
+                all_reqs.append(html2text(html).replace("\n\n", "\n"))
+        return "\n\n".join(all_reqs)
+
+    async def game_requirements(self, appid: int, app: Dict[str, Any]) -> Dict[str, str]:
+        """Requirements as text per supported platform, converted off the event loop and cached."""
+        loop = asyncio.get_running_loop()
+        texts = {}
+        for platform, supported in (app.get("platforms") or {}).items():
+            # Steam sends an empty list instead of an object for missing requirements
+            requirements = app.get(PLATFORM_REQUIREMENTS.get(platform, ""))
+            if not supported or not requirements or not isinstance(requirements, dict):
+                continue
+            key = f"{appid}:{platform}"
+            if (text := self._requirements.get(key)) is None:
+                text = await loop.run_in_executor(None, self.requirements_text, requirements)
+                self._requirements.put(key, text, 6 * 3600)
+            texts[platform] = text
+        return texts
 
-        all_platforms: Dict[str, str] = app.get("platforms", {})
-        index = 0
-        for key, value in all_platforms.items():
-            if value and app.get(platform_mapping[key]):
-                index += 1
-                em = discord.Embed(title=app["name"], colour=kwargs["colour"])
-                em.url = f"https://store.steampowered.com/app/{kwargs['id']}"
-                em.set_author(name="System Requirements")
-                em.set_thumbnail(url=(app.get("header_image") or "").replace("\\", ""))
-                all_reqs = []
-                if minimum := app[platform_mapping[key]].get("minimum"):
-                    all_reqs.append(html2text(minimum).replace("\n\n", "\n"))
-                if recommended := app[platform_mapping[key]].get("recommended"):
-                    all_reqs.append(html2text(recommended).replace("\n\n", "\n"))
-                em.description = "\n\n".join(all_reqs)
-                em.set_footer(
-                    text=f"Page {index} • Data provided by Steam",
-                    icon_url="https://i.imgur.com/xxr2UBZ.png",
-                )
-                pages.append(em)
+    @staticmethod
+    def game_requirements_embed(
+        app: Dict[str, Any], requirements: Dict[str, str], **kwargs
+    ) -> List[discord.Embed]:
+        pages = []
+        for index, text in enumerate(requirements.values(), start=1):
+            em = discord.Embed(title=app["name"], colour=kwargs["colour"])
+            em.url = f"https://store.steampowered.com/app/{kwargs['id']}"
+            em.set_author(name="System Requirements")
+            em.set_thumbnail(url=(app.get("header_image") or "").replace("\\", ""))
+            em.description = text
+            em.set_footer(
+                text=f"Page {index} • Data provided by Steam",
+                icon_url="https://i.imgur.com/xxr2UBZ.png",
+            )
+            pages.append(em)
         return pages
 
     @commands.command(name="gamereqs", usage="name of steam game")
@@ -287,20 +541,17 @@ class SteamCog(commands.Cog):
     async def game_system_requirements(self, ctx: commands.Context, *, query: QueryConverter):
         """Fetch system requirements for a Steam game, both minimum and recommended if any."""
         async with ctx.typing():
-            base_url = "https://store.steampowered.com/api/appdetails"
             user_region = (await self.config.user(ctx.author).region()) or "US"
-            data = await request(
-                base_url, params={"appids": str(query), "l": "en", "cc": user_region, "json": "1"}
-            )
-            if type(data) == int:
-                await ctx.send(f"⚠ API sent response code: https://http.cat/{data}")
+            app_data = await self.client.appdetails(query, user_region)
+            if type(app_data) == int:
+                await ctx.send(f"⚠ API sent response code: https://http.cat/{app_data}")
                 return
-            if not data:
+            if not app_data:
                 return await ctx.send("Something went wrong while querying Steam.")
 
-            app_data = data[f"{query}"].get("data")
+            requirements = await self.game_requirements(query, app_data)
             pages = self.game_requirements_embed(
-                app_data, colour=await ctx.embed_colour(), id=query
+                app_data, requirements, colour=await ctx.embed_colour(), id=query
             )
             if not pages:
                 await ctx.send("Hmmm, no system requirements info found for this game on Steam!")
@@ -343,22 +594,80 @@ class SteamCog(commands.Cog):
     async def gamedeal(self, ctx: commands.Context, *, query: GamedealsConverter):
         """Fetch cheapest deal for a PC game from cheaphark.com"""
         async with ctx.typing():
-            data = await request(f"{CHEAPSHARK}/api/1.0/deals?id={query}")
+            # CheapShark deal IDs come percent-encoded, params would encode them a second time
+            data = await self.client.get(
+                f"{CHEAPSHARK}/api/1.0/deals", params={"id": unquote(query)}
+            )
             if type(data) == int:
                 await ctx.send(f"⚠ API sent response code: https://http.cat/{data}")
                 return
             if not data:
                 return await ctx.send("\u26d4 Could not query CheapShark API!")
-
-            all_stores = await request(f"{CHEAPSHARK}/api/1.0/stores")
-            NEW_STORES = None
-            if all_stores and type(all_stores) == list:
-                NEW_STORES = {x["storeID"]: x["storeName"] for x in all_stores}
             if data["gameInfo"].get("salePrice") == data["gameInfo"].get("retailPrice"):
                 return await ctx.send("This game currently has no cheaper deals.")
-            embed = self.gamedeal_embed(NEW_STORES or STORES, query, data)
+            embed = self.gamedeal_embed(self.stores, query, data)
             return await ctx.send(embed=embed)
 
+    @commands.group(name="gamewatch", invoke_without_command=True)
+    async def game_watch(self, ctx: commands.Context):
+        """Get a DM when a PC game drops to your target price on CheapShark.
+
+        Prices are in USD and checked in the background every few minutes.
+        """
+        await ctx.send_help()
+
+    @game_watch.command(name="add")
+    @commands.cooldown(1, 10, commands.BucketType.user)
+    async def game_watch_add(
+        self, ctx: commands.Context, target_price: float, *, game: CheapSharkGameConverter
+    ):
+        """Watch a game for deals at or below `target_price` USD.
+
+        **Example:**
+            - `[p]gamewatch add 9.99 hollow knight`
+        """
+        if target_price < 0:
+            return await ctx.send("Target price can't be negative.")
+        await self._watchlist
+        watchlist = await self.config.user(ctx.author).watchlist()
+        game_id = str(game.get("gameID"))
+        if game_id not in watchlist and len(watchlist) >= MAX_WATCHES_PER_USER:
+            return await ctx.send(
+                f"You can watch up to {MAX_WATCHES_PER_USER} games, remove some first."
+            )
+        entry = WatchEntry(game.get("external") or f"Game #{game_id}", round(target_price, 2))
+        await self.config.user(ctx.author).watchlist.set_raw(game_id, value=entry.to_dict())
+        self.watcher.add(ctx.author.id, game_id, entry)
+        current = f" It's currently {game['cheapest']} USD." if game.get("cheapest") else ""
+        await ctx.send(
+            f"✅ I will DM you when **{entry.title}** drops to {entry.target:.2f} USD"
+            f" or below.{current}\nMake sure your DMs are open to me!"
+        )
+
+    @game_watch.command(name="list")
+    async def game_watch_list(self, ctx: commands.Context):
+        """See the games on your watchlist."""
+        watchlist = await self.config.user(ctx.author).watchlist()
+        if not watchlist:
+            return await ctx.send("Your watchlist is empty.")
+        lines = [
+            f"{i:>2}. {data['title'][:40]:<40} {data['target']:>8.2f} USD"
+            for i, data in enumerate(watchlist.values(), 1)
+        ]
+        await ctx.send(box("\n".join(lines)))
+
+    @game_watch.command(name="remove", aliases=["delete"])
+    async def game_watch_remove(self, ctx: commands.Context, number: int):
+        """Remove a game from your watchlist, by its number in `[p]gamewatch list`."""
+        await self._watchlist
+        watchlist = await self.config.user(ctx.author).watchlist()
+        if not 0 < number <= len(watchlist):
+            return await ctx.send("There is no game with that number on your watchlist.")
+        game_id = list(watchlist)[number - 1]
+        await self.config.user(ctx.author).watchlist.clear_raw(game_id)
+        self.watcher.remove(ctx.author.id, game_id)
+        await ctx.send(f"✅ Removed **{watchlist[game_id]['title']}** from your watchlist.")
+
     @staticmethod
     def latestdeals_embed(data: Dict[str, Any], **kwargs) -> discord.Embed:
         em = discord.Embed(colour=kwargs["colour"])
@@ -386,9 +695,10 @@ class SteamCog(commands.Cog):
             em.add_field(name="Rating", value=f"{rating}% ({review})")
         if len(em.fields) == 5:
             em.add_field(name="\u200b", value="\u200b")
-        em.set_footer(
-            text=f"Page {kwargs['page']} of {kwargs['pages']} • Data provided by CheapShark API"
-        )
+        footer = "Data provided by CheapShark API"
+        if kwargs.get("page"):
+            footer = f"Page {kwargs['page']} of {kwargs['pages']} • {footer}"
+        em.set_footer(text=footer)
         return em
 
     @commands.command()
@@ -400,38 +710,24 @@ class SteamCog(commands.Cog):
         `sort_by` argument accepts only any from below options:
         `deal rating`, `title`, `savings`, `price`, `metacritic`, `reviews`, `release`, `store`, `recent`
         """
-        allowed_sorts = [
-            "title",
-            "savings",
-            "price",
-            "metacritic",
-            "reviews",
-            "release",
-            "store",
-            "recent",
-            "deal rating",
-        ]
-        if sort_by.lower() not in allowed_sorts:
+        if sort_by.lower() not in DEAL_SORTS:
             return await ctx.send_help()
 
         async with ctx.typing():
-            result = await request(f"{CHEAPSHARK}/api/1.0/deals?sortBy={sort_by.lower()}")
+            result = await self.client.get(
+                f"{CHEAPSHARK}/api/1.0/deals", params={"sortBy": sort_by.lower()}
+            )
             if type(result) == int:
                 await ctx.send(f"⚠ API sent response code: https://http.cat/{result}")
                 return
             if not result:
                 return await ctx.send("\u26d4 Could not query CheapShark API!")
 
-            all_stores = await request(f"{CHEAPSHARK}/api/1.0/stores")
-            NEW_STORES = None
-            if all_stores and type(all_stores) == list:
-                NEW_STORES = {x["storeID"]: x["storeName"] for x in all_stores}
-
             pages = []
             for i, data in enumerate(result, 1):
                 em = self.latestdeals_embed(
                     data,
-                    stores=NEW_STORES or STORES,
+                    stores=self.stores,
                     colour=await ctx.embed_color(),
                     page=i,
                     pages=len(result),
@@ -439,3 +735,70 @@ class SteamCog(commands.Cog):
                 pages.append(em)
 
         await menu(ctx, pages, DEFAULT_CONTROLS, timeout=90.0)
+
+    @commands.group(name="dealsfeed", invoke_without_command=True)
+    @commands.guild_only()
+    @commands.mod_or_permissions(manage_channels=True)
+    async def deals_feed(self, ctx: commands.Context):
+        """Post new or cheaper CheapShark game deals in a channel automatically.
+
+        Deals are checked every 30 minutes and at most 5 are posted per check.
+        """
+        await ctx.send_help()
+
+    @deals_feed.command(name="set")
+    async def deals_feed_set(
+        self,
+        ctx: commands.Context,
+        channel: Optional[discord.TextChannel] = None,
+        max_price: Optional[float] = None,
+        *,
+        sort_by: str = "recent",
+    ):
+        """Set up or change the deals feed of a channel, defaults to current channel.
+
+        `max_price` is in USD and `sort_by` accepts the same options as `[p]latestdeals`.
+
+        **Example:**
+            - `[p]dealsfeed set #deals 10 savings`
+        """
+        channel = channel or ctx.channel
+        if sort_by.lower() not in DEAL_SORTS:
+            return await ctx.send(f"`sort_by` must be one of: {humanize_list(DEAL_SORTS)}")
+        if max_price is not None and max_price < 0:
+            return await ctx.send("Max price can't be negative.")
+        if not channel.permissions_for(ctx.me).embed_links:
+            return await ctx.send(f"I need `Embed Links` permission in {channel.mention}.")
+        settings = FeedSettings(sort_by=sort_by.lower(), max_price=max_price)
+        await self.config.channel(channel).deals_feed.set(settings.to_dict())
+        price = f" under {max_price:g} USD" if max_price is not None else ""
+        await ctx.send(
+            f"✅ New deals{price} sorted by `{settings.sort_by}` will be posted in"
+            f" {channel.mention}, starting with the ones after the next check."
+        )
+
+    @deals_feed.command(name="remove", aliases=["delete"])
+    async def deals_feed_remove(
+        self, ctx: commands.Context, channel: Optional[discord.TextChannel] = None
+    ):
+        """Stop the deals feed of a channel, defaults to current channel."""
+        channel = channel or ctx.channel
+        if not await self.config.channel(channel).deals_feed():
+            return await ctx.send(f"{channel.mention} has no deals feed.")
+        await self.config.channel(channel).deals_feed.clear()
+        await ctx.send(f"✅ Removed the deals feed of {channel.mention}.")
+
+    @deals_feed.command(name="show", aliases=["list"])
+    async def deals_feed_show(self, ctx: commands.Context):
+        """Show the deals feeds set up in this server."""
+        lines = []
+        for channel_id, data in (await self.config.all_channels()).items():
+            channel = ctx.guild.get_channel(channel_id)
+            if not channel or not data.get("deals_feed"):
+                continue
+            settings = FeedSettings(**data["deals_feed"])
+            price = f"{settings.max_price:g} USD" if settings.max_price is not None else "any"
+            lines.append(f"#{channel.name}: sort by {settings.sort_by}, max price {price}")
+        if not lines:
+            return await ctx.send("There are no deals feeds in this server.")
+        await ctx.send(box("\n".join(lines)))
@@ -1,5 +1,15 @@
-from typing import Dict
+from __future__ import annotations
 
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .client import CHEAPSHARK, SteamClient
+
+logger = logging.getLogger("red.owo.steamcog")
+
+# fallback for when the CheapShark store list hasn't been fetched (yet)
 STORES: Dict[str, str] = {
   "1": "Steam",
   "2": "GamersGate",
@@ -266,3 +276,70 @@ AVAILABLE_REGIONS: Dict[str, str] = {
     "zambia": "ZM",
     "zimbabwe": "ZW"
 }
+
+# one country per Steam pricing region, the default set for price comparisons
+PRICE_REGIONS = (
+    "US", "CA", "GB", "DE", "PL", "NO", "CH", "TR", "UA", "KZ", "IL", "SA", "AE", "QA", "KW",
+    "ZA", "IN", "CN", "JP", "KR", "HK", "TW", "SG", "MY", "ID", "PH", "TH", "VN", "AU", "NZ",
+    "BR", "MX", "CL", "CO", "PE", "UY", "CR", "AR",
+)
+
+
+@dataclass
+class StoreInfo:
+    store_id: str
+    name: str
+    active: bool = True
+    icon: Optional[str] = None
+
+
+class StoreDirectory:
+    """CheapShark stores by ``storeID``, kept in memory and refreshed on a schedule.
+
+    Starts out from the bundled :data:`STORES` so lookups never have to wait
+    on the API, and indexing gives the store name like the plain dict did.
+    """
+
+    def __init__(self) -> None:
+        self.stores: Dict[str, StoreInfo] = {
+            store_id: StoreInfo(store_id, name) for store_id, name in STORES.items()
+        }
+        self.updated_at: Optional[float] = None
+
+    def __getitem__(self, store_id: str) -> str:
+        return self.name(store_id)
+
+    def __len__(self) -> int:
+        return len(self.stores)
+
+    def name(self, store_id: str) -> str:
+        store = self.stores.get(str(store_id))
+        return store.name if store else f"Store #{store_id}"
+
+    def active(self) -> List[StoreInfo]:
+        return [store for store in self.stores.values() if store.active]
+
+    def update(self, payload: List[Dict[str, Any]]) -> None:
+        stores = {}
+        for entry in payload:
+            if not (store_id := entry.get("storeID")) or not entry.get("storeName"):
+                continue
+            icon = (entry.get("images") or {}).get("icon")
+            stores[str(store_id)] = StoreInfo(
+                str(store_id),
+                entry["storeName"],
+                bool(entry.get("isActive", 1)),
+                f"{CHEAPSHARK}{icon}" if icon else None,
+            )
+        if stores:
+            self.stores = stores
+            self.updated_at = time.time()
+
+    async def refresh(self, client: SteamClient) -> bool:
+        # bypass the response cache, this is the only place that asks for the store list
+        data = await client.get(f"{CHEAPSHARK}/api/1.0/stores", ttl=0)
+        if isinstance(data, int) or not isinstance(data, list):
+            logger.info(f"Could not refresh CheapShark store list: {data!r}")
+            return False
+        self.update(data)
+        return True
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Mapping, Optional, Set
+
+from .client import CHEAPSHARK, SteamClient
+
+logger = logging.getLogger("red.owo.steamcog")
+
+# CheapShark's multi game lookup takes at most 25 IDs per request
+MAX_IDS_PER_REQUEST = 25
+MAX_WATCHES_PER_USER = 25
+
+
+@dataclass
+class WatchEntry:
+    title: str
+    target: float
+    # cheapest price the user was last told about, None while above target
+    notified: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"title": self.title, "target": self.target, "notified": self.notified}
+
+
+@dataclass
+class PriceUpdate:
+    user_id: int
+    game_id: str
+    entry: WatchEntry
+    # True if the user should be told about the price, False if it only went back up
+    dropped: bool
+    price: float
+    retail_price: Optional[float] = None
+    deal_id: Optional[str] = None
+    store_id: Optional[str] = None
+    thumb: Optional[str] = None
+    steam_app_id: Optional[str] = None
+
+
+def _float_or_none(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+class PriceWatcher:
+    """Everyone's CheapShark price watches, checked per game rather than per user.
+
+    Watched game IDs go round robin through a queue and every :meth:`poll`
+    looks up the next ``requests_per_poll`` batches of up to 25 games, so the
+    request rate stays fixed no matter how many people watch a game.
+    """
+
+    def __init__(self, client: SteamClient, *, requests_per_poll: int = 2) -> None:
+        self.client = client
+        self.requests_per_poll = requests_per_poll
+        # game_id -> user_id -> entry
+        self.watches: Dict[str, Dict[int, WatchEntry]] = {}
+        self._queue: Deque[str] = deque()
+        self._queued: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.watches)
+
+    def load(self, all_users: Mapping[int, Mapping[str, Any]]) -> None:
+        self.watches.clear()
+        self._queue.clear()
+        self._queued.clear()
+        for user_id, data in all_users.items():
+            for game_id, raw in (data.get("watchlist") or {}).items():
+                self.add(int(user_id), game_id, WatchEntry(**raw))
+
+    def add(self, user_id: int, game_id: str, entry: WatchEntry) -> None:
+        self.watches.setdefault(game_id, {})[user_id] = entry
+        if game_id not in self._queued:
+            # new games go first so people don't wait a full round for the first check
+            self._queue.appendleft(game_id)
+            self._queued.add(game_id)
+
+    def remove(self, user_id: int, game_id: str) -> None:
+        users = self.watches.get(game_id, {})
+        users.pop(user_id, None)
+        if not users:
+            self.watches.pop(game_id, None)
+
+    def forget_user(self, user_id: int) -> None:
+        for game_id in list(self.watches):
+            self.remove(user_id, game_id)
+
+    def is_current(self, update: PriceUpdate) -> bool:
+        """Whether the watch of an update is still there, and wasn't replaced since the poll."""
+        return self.watches.get(update.game_id, {}).get(update.user_id) is update.entry
+
+    def _next_ids(self, limit: int) -> List[str]:
+        ids: List[str] = []
+        # every ID is looked at once per poll at most, unwatched ones are dropped here lazily
+        for _ in range(len(self._queue)):
+            if len(ids) == limit:
+                break
+            game_id = self._queue.popleft()
+            if game_id in self.watches:
+                ids.append(game_id)
+                self._queue.append(game_id)
+            else:
+                self._queued.discard(game_id)
+        return ids
+
+    def _check(self, game_id: str, game: Mapping[str, Any]) -> List[PriceUpdate]:
+        prices = []
+        for deal in game.get("deals") or []:
+            # skip malformed rows instead of failing the whole poll on them
+            try:
+                prices.append((float(deal["price"]), deal))
+            except (TypeError, ValueError, KeyError):
+                continue
+        if not prices:
+            return []
+        price, best = min(prices, key=lambda p: p[0])
+        info = game.get("info") or {}
+        updates = []
+        for user_id, entry in self.watches.get(game_id, {}).items():
+            if price <= entry.target and (entry.notified is None or price < entry.notified):
+                entry.notified, dropped = price, True
+            elif price > entry.target and entry.notified is not None:
+                entry.notified, dropped = None, False
+            else:
+                continue
+            updates.append(
+                PriceUpdate(
+                    user_id,
+                    game_id,
+                    entry,
+                    dropped,
+                    price,
+                    _float_or_none(best.get("retailPrice")),
+                    best.get("dealID"),
+                    best.get("storeID"),
+                    info.get("thumb"),
+                    info.get("steamAppID"),
+                )
+            )
+        return updates
+
+    async def poll(self) -> List[PriceUpdate]:
+        """Check the next batches of watched games, returns the watches whose state changed."""
+        updates: List[PriceUpdate] = []
+        ids = self._next_ids(self.requests_per_poll * MAX_IDS_PER_REQUEST)
+        for start in range(0, len(ids), MAX_IDS_PER_REQUEST):
+            batch = ids[start : start + MAX_IDS_PER_REQUEST]
+            data = await self.client.get(
+                f"{CHEAPSHARK}/api/1.0/games", params={"ids": ",".join(batch)}, ttl=0
+            )
+            if isinstance(data, int) or not isinstance(data, dict):
+                logger.info(f"CheapShark price check failed for {len(batch)} games: {data!r}")
+                break
+            for game_id, game in data.items():
+                if isinstance(game, dict):
+                    try:
+                        updates.extend(self._check(str(game_id), game))
+                    except Exception:
+                        logger.exception(f"Failed to check CheapShark prices of game {game_id}")
+        return updates
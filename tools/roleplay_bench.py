@@ -0,0 +1,238 @@
+"""Load test for the roleplay cog's counter updates, not shipped with the cog.
+
+Run it from the repository root, in an environment with Red installed::
+
+    python -m tools.roleplay_bench --invocations 5000 --members 50 --latency-ms 1
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from random import choice, sample
+from typing import Any, Dict, List, Optional, Tuple
+
+from roleplay.counters import CounterStore, Scope, unpack
+from roleplay.graph import InteractionGraph
+
+BENCH_ACTIONS = ("HUGS", "PATS", "SLAPS")
+BENCH_GUILD_ID = 1
+
+# what the cog registers, keyed by the Config method used to reach the group
+_DEFAULTS = {
+    "member": {"stats": [], "interactions": {"sent": [], "received": []}},
+    "user": {"stats": []},
+}
+
+
+class _ValueContext:
+    """``await value()`` reads, ``async with value() as v`` reads then writes back, like Red's."""
+
+    def __init__(self, value: "MemoryValue") -> None:
+        self.value = value
+        self.raw: Any = None
+
+    def __await__(self):
+        return self.value.config.read(self.value.key, self.value.default).__await__()
+
+    async def __aenter__(self) -> Any:
+        self.raw = await self.value.config.read(self.value.key, self.value.default)
+        return self.raw
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.value.config.write(self.value.key, self.raw)
+
+
+class MemoryValue:
+    def __init__(self, config: "MemoryConfig", key: Tuple[Any, ...], default: Any) -> None:
+        self.config = config
+        self.key = key
+        self.default = default
+
+    def __call__(self) -> _ValueContext:
+        return _ValueContext(self)
+
+    async def set(self, value: Any) -> None:
+        await self.config.write(self.key, value)
+
+
+class MemoryGroup:
+    def __init__(self, config: "MemoryConfig", kind: str, ids: Tuple[int, ...]) -> None:
+        self._config = config
+        self._kind = kind
+        self._ids = ids
+
+    def __getattr__(self, name: str) -> MemoryValue:
+        return MemoryValue(
+            self._config, (self._kind, *self._ids, name), _DEFAULTS[self._kind][name]
+        )
+
+
+class MemoryConfig:
+    """Just enough of Red's Config for the counter and interaction stores.
+
+    Values are deep copied on the way in and out like a real driver would,
+    every read and write counts as one op and can take ``latency`` seconds,
+    which gives concurrent commands the chance to interleave.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.data: Dict[Tuple[Any, ...], Any] = {}
+        self.ops: Counter = Counter()
+
+    async def read(self, key: Tuple[Any, ...], default: Any) -> Any:
+        self.ops["read"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return copy.deepcopy(self.data.get(key, default))
+
+    async def write(self, key: Tuple[Any, ...], value: Any) -> None:
+        self.ops["write"] += 1
+        value = copy.deepcopy(value)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.data[key] = value
+
+    def member_from_ids(self, guild_id: int, user_id: int) -> MemoryGroup:
+        return MemoryGroup(self, "member", (guild_id, user_id))
+
+    def user_from_id(self, user_id: int) -> MemoryGroup:
+        return MemoryGroup(self, "user", (user_id,))
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+@dataclass
+class BenchResult:
+    invocations: int
+    members: int
+    duration: float
+    ops: Counter
+    # milliseconds, sorted
+    latencies: List[float]
+    flushes: int = 0
+    mismatches: List[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        reads, writes = self.ops["read"], self.ops["write"]
+        per_command = (reads + writes) / self.invocations if self.invocations else 0
+        lat = self.latencies
+        return (
+            f"Invocations:  {self.invocations:,} across {self.members} members\n"
+            f"Wall time:  {self.duration:.2f} seconds"
+            f" ({self.invocations / max(self.duration, 1e-9):,.0f} commands/s)\n"
+            f"Background flushes:  {self.flushes}\n"
+            f"Config ops:  {reads:,} reads, {writes:,} writes ({per_command:.3f} per command)\n"
+            f"Latency (ms):  p50 {percentile(lat, 50):.2f}, p90 {percentile(lat, 90):.2f},"
+            f" p99 {percentile(lat, 99):.2f}, max {lat[-1] if lat else 0:.2f}\n"
+            f"Final counts:  "
+            + ("exact" if not self.mismatches else f"{len(self.mismatches)} MISMATCHES")
+        )
+
+
+async def run_bench(
+    invocations: int = 5000,
+    members: int = 50,
+    *,
+    latency: float = 0.001,
+    flush_interval: Optional[float] = 0.05,
+) -> BenchResult:
+    """Fire ``invocations`` concurrent hug/pat/slap counter updates and check the outcome.
+
+    This drives the same :class:`CounterStore` and :class:`InteractionGraph`
+    code the commands use, against a :class:`MemoryConfig`, with flushes
+    running in the background every ``flush_interval`` seconds.
+    """
+    config = MemoryConfig(latency)
+    counters = CounterStore(config)
+    counters.ready.set()
+    graph = InteractionGraph(config)
+    expected: Counter = Counter()
+    latencies: List[float] = []
+    flushes = 0
+    members = max(members, 2)
+
+    async def invoke() -> None:
+        action = choice(BENCH_ACTIONS)
+        sender, receiver = sample(range(1, members + 1), 2)
+        updates = counters.action_updates(BENCH_GUILD_ID, sender, receiver, action)
+        expected.update(updates)
+        start = time.perf_counter()
+        await counters.increment(*updates)
+        await graph.record(BENCH_GUILD_ID, sender, receiver, action)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    async def flusher() -> None:
+        nonlocal flushes
+        # not cancelled, a flush interrupted halfway would drop the deltas it took
+        while not done.is_set():
+            await asyncio.sleep(flush_interval)
+            await counters.flush()
+            await graph.flush()
+            flushes += 1
+
+    done = asyncio.Event()
+    flush_task = asyncio.create_task(flusher()) if flush_interval else None
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(invoke() for _ in range(invocations)))
+    finally:
+        done.set()
+        if flush_task:
+            await flush_task
+    await counters.flush()
+    await graph.flush()
+    duration = time.perf_counter() - start
+
+    mismatches = []
+    stored: Dict[Scope, List[int]] = {}
+    for (scope, index), count in expected.items():
+        if scope not in stored:
+            kind = "member" if len(scope) == 2 else "user"
+            stored[scope] = unpack(config.data.get((kind, *scope, "stats"), []))
+        if stored[scope][index] != count:
+            mismatches.append(f"{scope} slot {index}: {stored[scope][index]} != {count}")
+    # Space-Saving replacements add exactly one too, so edge counts always sum up
+    for direction in ("sent", "received"):
+        total = sum(
+            edge[2]
+            for key, value in config.data.items()
+            if key[-1] == "interactions"
+            for edge in value[direction]
+        )
+        if total != invocations:
+            mismatches.append(f"{direction} interactions: {total} != {invocations}")
+
+    return BenchResult(
+        invocations, members, duration, config.ops, sorted(latencies), flushes, mismatches
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--invocations", type=int, default=5000)
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument(
+        "--latency-ms", type=float, default=1.0, help="time every Config read/write takes"
+    )
+    args = parser.parse_args()
+    result = asyncio.run(
+        run_bench(args.invocations, args.members, latency=max(args.latency_ms, 0) / 1000)
+    )
+    print(result)
+    for mismatch in result.mismatches:
+        print(mismatch)
+    raise SystemExit(1 if result.mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()